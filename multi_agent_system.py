@@ -12,11 +12,48 @@ import numpy as np
 from datetime import datetime, timedelta
 import time
 import json
+import logging
+import threading
+from collections import deque
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+# Yahoo Finance pacing: cap in-flight requests and calls per rolling window
+YAHOO_CONCURRENT = 4
+YAHOO_MAX_CALLS = 10
+YAHOO_PERIOD = 1.0
+
+class RateLimiter:
+    """Sliding-window rate limiter usable as a context manager"""
+    
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+        self.lock = threading.Lock()
+    
+    def __enter__(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(now)
+                    return self
+                wait = self.period - (now - self.calls[0])
+            time.sleep(wait)
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_bucket = threading.Semaphore(YAHOO_CONCURRENT)
+_rate = RateLimiter(max_calls=YAHOO_MAX_CALLS, period=YAHOO_PERIOD)
+
 @dataclass
 class TradingRecommendation:
     """Standard recommendation format for all agents"""
@@ -32,9 +69,10 @@ class TradingRecommendation:
 class BaseAgent:
     """Base class for all trading agents"""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, default_timeframe: str = "LONG"):
         self.name = name
         self.expertise = []
+        self.default_timeframe = default_timeframe
         
     def analyze(self, symbol: str) -> TradingRecommendation:
         """Override this method in each agent"""
@@ -44,25 +82,40 @@ class BaseAgent:
         """Helper method to get stock data"""
         try:
             ticker = yf.Ticker(symbol)
-            return ticker.history(period=period)
+            with _bucket, _rate:
+                return ticker.history(period=period)
         except Exception as e:
             print(f"Error fetching data for {symbol}: {e}")
             return pd.DataFrame()
+    
+    def _default_recommendation(self, symbol: str, reason: str) -> TradingRecommendation:
+        """Neutral HOLD used when an agent cannot complete its analysis"""
+        return TradingRecommendation(
+            symbol=symbol,
+            action="HOLD",
+            confidence=50,
+            target_price=None,
+            reasoning=reason,
+            risk_level="MEDIUM",
+            timeframe=self.default_timeframe,
+            agent_name=self.name
+        )
 
 class ValueAgent(BaseAgent):
     """Warren Buffett-style value analysis agent"""
     
     def __init__(self):
-        super().__init__("Value Agent")
+        super().__init__("Value Agent", default_timeframe="LONG")
         self.expertise = ["fundamentals", "valuation", "long_term_growth"]
     
     def analyze(self, symbol: str) -> TradingRecommendation:
         """Analyze stock from value investing perspective"""
-        print(f"🔍 {self.name} analyzing {symbol}...")
+        logger.debug("%s analyzing %s", self.name, symbol)
         
         try:
             ticker = yf.Ticker(symbol)
-            info = ticker.info
+            with _bucket, _rate:
+                info = ticker.info
             hist = self.get_stock_data(symbol, "2y")
             
             if hist.empty:
@@ -147,29 +200,17 @@ class ValueAgent(BaseAgent):
             
         except Exception as e:
             return self._default_recommendation(symbol, f"Analysis error: {e}")
-    
-    def _default_recommendation(self, symbol: str, reason: str) -> TradingRecommendation:
-        return TradingRecommendation(
-            symbol=symbol,
-            action="HOLD",
-            confidence=50,
-            target_price=None,
-            reasoning=reason,
-            risk_level="MEDIUM",
-            timeframe="LONG",
-            agent_name=self.name
-        )
 
 class TechnicalAgent(BaseAgent):
     """Technical analysis agent for timing and momentum"""
     
     def __init__(self):
-        super().__init__("Technical Agent")
+        super().__init__("Technical Agent", default_timeframe="MEDIUM")
         self.expertise = ["charts", "momentum", "timing"]
     
     def analyze(self, symbol: str) -> TradingRecommendation:
         """Analyze stock from technical perspective"""
-        print(f"📈 {self.name} analyzing {symbol}...")
+        logger.debug("%s analyzing %s", self.name, symbol)
         
         try:
             hist = self.get_stock_data(symbol, "6mo")
@@ -268,29 +309,17 @@ class TechnicalAgent(BaseAgent):
             
         except Exception as e:
             return self._default_recommendation(symbol, f"Technical analysis error: {e}")
-    
-    def _default_recommendation(self, symbol: str, reason: str) -> TradingRecommendation:
-        return TradingRecommendation(
-            symbol=symbol,
-            action="HOLD",
-            confidence=50,
-            target_price=None,
-            reasoning=reason,
-            risk_level="MEDIUM",
-            timeframe="MEDIUM",
-            agent_name=self.name
-        )
 
 class RiskAgent(BaseAgent):
     """Risk management and position sizing agent"""
     
     def __init__(self):
-        super().__init__("Risk Manager")
+        super().__init__("Risk Manager", default_timeframe="LONG")
         self.expertise = ["risk_management", "position_sizing", "volatility"]
     
     def analyze(self, symbol: str) -> TradingRecommendation:
         """Analyze risk characteristics"""
-        print(f"⚠️ {self.name} analyzing {symbol}...")
+        logger.debug("%s analyzing %s", self.name, symbol)
         
         try:
             hist = self.get_stock_data(symbol, "1y")
@@ -363,18 +392,6 @@ class RiskAgent(BaseAgent):
         peak = prices.expanding().max()
         drawdown = ((prices - peak) / peak) * 100
         return abs(drawdown.min())
-    
-    def _default_recommendation(self, symbol: str, reason: str) -> TradingRecommendation:
-        return TradingRecommendation(
-            symbol=symbol,
-            action="HOLD",
-            confidence=50,
-            target_price=None,
-            reasoning=reason,
-            risk_level="MEDIUM",
-            timeframe="LONG",
-            agent_name=self.name
-        )
 
 class PortfolioManager:
     """Combines agent recommendations into final decisions"""
@@ -397,7 +414,6 @@ class PortfolioManager:
             try:
                 rec = agent.analyze(symbol)
                 recommendations.append(rec)
-                time.sleep(0.5)  # Be nice to APIs
             except Exception as e:
                 print(f"Error with {agent.name}: {e}")
                 continue
@@ -503,6 +519,7 @@ class PortfolioManager:
 
 def main():
     """Test the multi-agent system"""
+    logging.basicConfig(level=logging.INFO)
     portfolio_manager = PortfolioManager()
     
     # Test on Intel position
@@ -518,8 +535,6 @@ def main():
             print("-" * 60)
         except Exception as e:
             print(f"❌ Error analyzing {symbol}: {e}")
-        
-        time.sleep(2)  # Pause between symbols
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
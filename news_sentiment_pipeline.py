@@ -11,13 +11,107 @@ import time
 import json
 import os
 import re
+import shelve
+import logging
+import functools
+import hashlib
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+try:
+    import ahocorasick  # pyahocorasick: single-pass multi-substring matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2 as re_fast  # google-re2: linear-time matching, no backtracking
+except ImportError:
+    re_fast = re
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 from smart_data_manager import SmartDataManager
 
+logger = logging.getLogger(__name__)
+
+# Bump when scoring logic changes in ways the keyword/pattern tables don't capture
+_ARTICLE_CACHE_SCHEMA = 2
+_CACHE_VERSION_KEY = '__scoring_version__'
+
+def _reduce_sentiment_loop(scores, mags, rels):
+    """Fused single-pass sentiment reduction (compiled with numba when available)
+    
+    Returns (overall, strength, n_pos, n_neg, recent_mean, older_mean).
+    """
+    n = scores.shape[0]
+    half = n // 2
+    
+    # Weight only high-relevance articles, falling back to all of them
+    k = 0
+    for i in range(n):
+        if rels[i] > 0.6:
+            k += 1
+    use_all = k == 0
+    if use_all:
+        k = n
+    
+    total_sentiment = 0.0
+    total_weight = 0.0
+    strength = 0.0
+    recent = 0.0
+    older = 0.0
+    n_pos = 0
+    n_neg = 0
+    j = 0
+    for i in range(n):
+        s = scores[i]
+        if use_all or rels[i] > 0.6:
+            # Recent articles get higher weight
+            w = mags[i] * rels[i] * (1.0 - j / k * 0.5)
+            total_sentiment += s * w
+            total_weight += w
+            j += 1
+        strength += mags[i]
+        if s > 0.2:
+            n_pos += 1
+        elif s < -0.2:
+            n_neg += 1
+        if i < half:
+            recent += s
+        else:
+            older += s
+    
+    overall = total_sentiment / total_weight if total_weight > 0 else 0.0
+    recent_mean = recent / half if half > 0 else 0.0
+    return overall, strength / n, n_pos, n_neg, recent_mean, older / (n - half)
+
+def _reduce_sentiment_numpy(scores, mags, rels):
+    """Vectorized equivalent of _reduce_sentiment_loop for environments without numba"""
+    n = len(scores)
+    half = n // 2
+    
+    relevant = rels > 0.6
+    if not relevant.any():
+        relevant[:] = True
+    
+    rel_scores = scores[relevant]
+    k = len(rel_scores)
+    weights = mags[relevant] * rels[relevant] * (1.0 - np.arange(k) / k * 0.5)
+    total_weight = float(weights.sum())
+    overall = float(weights @ rel_scores) / total_weight if total_weight > 0 else 0.0
+    
+    n_pos = int(np.count_nonzero(scores > 0.2))
+    n_neg = int(np.count_nonzero(scores < -0.2))
+    recent_mean = float(scores[:half].mean()) if half > 0 else 0.0
+    return overall, float(mags.mean()), n_pos, n_neg, recent_mean, float(scores[half:].mean())
+
+_reduce_sentiment = njit(cache=True, fastmath=True)(_reduce_sentiment_loop) if njit else _reduce_sentiment_numpy
+
 @dataclass
 class NewsArticle:
     title: str
@@ -32,6 +126,55 @@ class NewsArticle:
     relevance_score: float  # 0 to 1 (how relevant to trading)
     key_phrases: List[str]
 
+@dataclass
+class ArticleBatch:
+    """Columnar (struct-of-arrays) articles for one symbol"""
+    symbol: str
+    scores: np.ndarray  # sentiment_score per article
+    mags: np.ndarray  # sentiment_magnitude per article
+    rels: np.ndarray  # relevance_score per article
+    raw: List[Dict]  # Original Tiingo article dicts, only read for display
+    key_phrases: List[List[str]]
+    
+    def __len__(self) -> int:
+        return len(self.raw)
+    
+    @classmethod
+    def allocate(cls, symbol: str, capacity: int) -> 'ArticleBatch':
+        """Preallocate columns for up to `capacity` articles"""
+        return cls(symbol, np.empty(capacity), np.empty(capacity), np.empty(capacity), [], [])
+    
+    def add(self, article_data: Dict, score: float, magnitude: float, relevance: float, key_phrases: List[str]):
+        """Write one processed article into the next free row"""
+        i = len(self.raw)
+        self.scores[i] = score
+        self.mags[i] = magnitude
+        self.rels[i] = relevance
+        self.raw.append(article_data)
+        self.key_phrases.append(key_phrases)
+    
+    def trim(self) -> 'ArticleBatch':
+        """Drop unused preallocated rows (views, no copy)"""
+        n = len(self.raw)
+        return ArticleBatch(self.symbol, self.scores[:n], self.mags[:n], self.rels[:n], self.raw, self.key_phrases)
+    
+    def article(self, i: int) -> NewsArticle:
+        """Materialize a single NewsArticle (used for recent_news only)"""
+        raw = self.raw[i]
+        return NewsArticle(
+            title=raw.get('title', ''),
+            description=raw.get('description', ''),
+            url=raw.get('url', ''),
+            published_date=raw.get('publishedDate', ''),
+            source=raw.get('source', ''),
+            tickers=raw.get('tickers', [self.symbol]),
+            tags=raw.get('tags', []),
+            sentiment_score=float(self.scores[i]),
+            sentiment_magnitude=float(self.mags[i]),
+            relevance_score=float(self.rels[i]),
+            key_phrases=list(self.key_phrases[i])  # Records are shared by every symbol an article mentions
+        )
+
 @dataclass
 class TickerSentiment:
     symbol: str
@@ -48,9 +191,10 @@ class TickerSentiment:
     confidence: float  # 0 to 100
 
 class NewsSentimentPipeline:
-    def __init__(self):
+    def __init__(self, verbose: bool = True):
         """Initialize news sentiment pipeline with premium Tiingo access"""
         self.data_manager = SmartDataManager()
+        self.verbose = verbose
         
         # Sentiment keywords for basic analysis (can be enhanced with ML models)
         self.positive_keywords = {
@@ -78,120 +222,205 @@ class NewsSentimentPipeline:
             'analyst upgrade': 1.2, 'analyst downgrade': 1.2, 'stock split': 1.1, 'dividend increase': 1.1
         }
         
-        print("📰 NEWS SENTIMENT PIPELINE INITIALIZED")
-        print("   🚀 Premium Tiingo News API access")
-        print("   🧠 AI-powered sentiment analysis")
-        print("   📊 Multi-symbol batch processing")
-        print("   🎯 Trading signal generation")
+        # High relevance keywords
+        self.trading_keywords = frozenset([
+            'earnings', 'revenue', 'profit', 'loss', 'guidance', 'forecast',
+            'analyst', 'rating', 'upgrade', 'downgrade', 'target', 'price',
+            'merger', 'acquisition', 'partnership', 'deal', 'contract',
+            'fda', 'approval', 'clinical', 'trial', 'product', 'launch',
+            'ceo', 'management', 'restructuring', 'layoffs', 'hiring',
+            'dividend', 'split', 'buyback', 'debt', 'financing', 'ipo'
+        ])
+        
+        # Aho-Corasick automaton replaces one substring scan per phrase (built on first use)
+        self._impact_ac = None
+        
+        # Per-URL scores persisted across runs so repeat stories skip text analysis
+        self.article_cache_path = "data/sentiment_analysis/.article_cache.db"
+        self.article_cache_max_age = 30 * 24 * 3600  # Seconds; news older than this isn't re-fetched
+        self.article_cache_max_entries = 50_000
+        self._article_cache_pruned = False
+        
+        # Precompiled regexes (compiled once instead of per article)
+        self._word_re = re.compile(r'\b\w+\b')
+        sentiment_words = sorted(self.positive_keywords.keys() | self.negative_keywords.keys(), key=len, reverse=True)
+        self._sent_re = re.compile(r'\b(?:' + '|'.join(map(re.escape, sentiment_words)) + r')\b')
+        
+        # Common trading-relevant phrases
+        key_patterns = [
+            r'earnings\s+beat', r'earnings\s+miss', r'guidance\s+raised', r'guidance\s+lowered',
+            r'analyst\s+upgrade', r'analyst\s+downgrade', r'price\s+target', r'revenue\s+up',
+            r'revenue\s+down', r'profit\s+up', r'profit\s+down', r'new\s+product',
+            r'product\s+launch', r'fda\s+approval', r'merger\s+announced', r'acquisition',
+            r'ceo\s+resigns?', r'new\s+ceo', r'dividend\s+increase', r'stock\s+split'
+        ]
+        # One scan per pattern (a single alternation would drop overlapping phrases)
+        self._key_patterns = [re_fast.compile(p) for p in key_patterns]
+        
+        # Cached article scores are only valid for this exact scoring setup
+        self._scoring_version = hashlib.sha1(repr((
+            _ARTICLE_CACHE_SCHEMA, sorted(self.positive_keywords.items()), sorted(self.negative_keywords.items()),
+            sorted(self.impact_multipliers.items()), sorted(self.trading_keywords), key_patterns
+        )).encode()).hexdigest()[:12]
+        
+        # Memoize sentiment scoring (immutable results; full records persist in the article cache)
+        self._analyze_sentiment = functools.lru_cache(maxsize=16384)(self._analyze_sentiment)
+        
+        if self.verbose:
+            print("📰 NEWS SENTIMENT PIPELINE INITIALIZED")
+            print("   🚀 Premium Tiingo News API access")
+            print("   🧠 AI-powered sentiment analysis")
+            print("   📊 Multi-symbol batch processing")
+            print("   🎯 Trading signal generation")
+    
+    @staticmethod
+    def _build_automaton(words: Dict):
+        """Build an Aho-Corasick automaton mapping each word to its value (None if unavailable)"""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for word, value in words.items():
+            automaton.add_word(word, value)
+        automaton.make_automaton()
+        return automaton
+    
+    @property
+    def impact_automaton(self):
+        """Lazily compiled impact-phrase automaton (None without pyahocorasick)"""
+        if self._impact_ac is None and ahocorasick is not None:
+            self._impact_ac = self._build_automaton(self.impact_multipliers)
+        return self._impact_ac
     
     def get_news_for_symbols(self, symbols: List[str], days_back: int = 7, 
-                           limit_per_symbol: int = 20) -> Dict[str, List[NewsArticle]]:
+                           limit_per_symbol: int = 20) -> Dict[str, ArticleBatch]:
         """Get news articles for multiple symbols"""
-        print(f"\n📰 FETCHING NEWS FOR {len(symbols)} SYMBOLS")
-        print(f"   📅 Period: Last {days_back} days")
-        print(f"   📊 Limit: {limit_per_symbol} articles per symbol")
-        print("=" * 60)
+        if self.verbose:
+            print(f"\n📰 FETCHING NEWS FOR {len(symbols)} SYMBOLS")
+            print(f"   📅 Period: Last {days_back} days")
+            print(f"   📊 Limit: {limit_per_symbol} articles per symbol")
+            print("=" * 60)
         
         start_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
-        symbol_news = {}
         
-        for i, symbol in enumerate(symbols, 1):
-            print(f"[{i}/{len(symbols)}] Fetching news for {symbol}...")
-            
-            try:
-                # Get news from Tiingo (premium feature)
-                news_data = self.data_manager.tiingo_provider.get_market_news(
-                    symbols=[symbol], 
-                    limit=limit_per_symbol,
-                    start_date=start_date
-                )
+        # One batched Tiingo query for every symbol (Tiingo caps limit at 1000)
+        try:
+            news_data = self.data_manager.tiingo_provider.get_market_news(
+                symbols=symbols, 
+                limit=min(1000, limit_per_symbol * len(symbols)),
+                start_date=start_date
+            ) or []
+        except Exception as e:
+            logger.warning("Error fetching news: %s", e)
+            news_data = []
+        
+        capacity = min(limit_per_symbol, len(news_data))
+        symbol_news = {symbol: ArticleBatch.allocate(symbol, capacity) for symbol in symbols}
+        by_ticker = {symbol.lower(): symbol for symbol in symbols}
+        
+        # Score each article once and dispatch it to every requested symbol it mentions
+        with self._open_article_cache() as article_cache:
+            for article_data in news_data:
+                matched = {by_ticker[t.lower()] for t in article_data.get('tickers', []) if t.lower() in by_ticker}
+                batches = [symbol_news[symbol] for symbol in matched if len(symbol_news[symbol]) < limit_per_symbol]
+                if not batches:
+                    continue
                 
-                if news_data:
-                    processed_articles = []
-                    for article_data in news_data:
-                        article = self._process_article(article_data, symbol)
-                        if article:
-                            processed_articles.append(article)
-                    
-                    symbol_news[symbol] = processed_articles
-                    print(f"   ✅ {len(processed_articles)} articles processed")
-                else:
-                    print(f"   ❌ No news data available")
-                    symbol_news[symbol] = []
-                    
-            except Exception as e:
-                print(f"   ⚠️ Error fetching news for {symbol}: {e}")
-                symbol_news[symbol] = []
-            
-            # Rate limiting for API calls
-            time.sleep(0.1)
+                record = self._process_article(article_data, article_cache)
+                if record:
+                    for batch in batches:
+                        batch.add(article_data, *record)
+        
+        symbol_news = {symbol: batch.trim() for symbol, batch in symbol_news.items()}
         
         total_articles = sum(len(articles) for articles in symbol_news.values())
-        print(f"\n📊 NEWS COLLECTION COMPLETE")
-        print(f"   📰 Total articles: {total_articles}")
-        print(f"   📈 Symbols with news: {len([s for s, a in symbol_news.items() if a])}")
+        symbols_with_news = sum(1 for articles in symbol_news.values() if articles)
+        logger.info("📊 News collection complete: %d articles, %d/%d symbols with news",
+                    total_articles, symbols_with_news, len(symbols))
         
         return symbol_news
     
-    def _process_article(self, article_data: Dict, primary_symbol: str) -> Optional[NewsArticle]:
-        """Process raw article data into structured NewsArticle"""
+    def _open_article_cache(self) -> shelve.Shelf:
+        """Open the article score cache, starting fresh if scoring changed since it was written"""
+        os.makedirs(os.path.dirname(self.article_cache_path), exist_ok=True)
+        article_cache = shelve.open(self.article_cache_path)
+        if article_cache.get(_CACHE_VERSION_KEY) != self._scoring_version:
+            article_cache.close()
+            article_cache = shelve.open(self.article_cache_path, flag='n')
+            article_cache[_CACHE_VERSION_KEY] = self._scoring_version
+        elif not self._article_cache_pruned:
+            self._prune_article_cache(article_cache)
+        self._article_cache_pruned = True
+        return article_cache
+    
+    def _prune_article_cache(self, article_cache: shelve.Shelf):
+        """Drop entries older than article_cache_max_age, then the oldest beyond article_cache_max_entries"""
+        cutoff = time.time() - self.article_cache_max_age
+        stamped = sorted((article_cache[url][0], url) for url in list(article_cache.keys()) if url != _CACHE_VERSION_KEY)
+        fresh_start = next((i for i, (ts, _) in enumerate(stamped) if ts >= cutoff), len(stamped))
+        drop = max(fresh_start, len(stamped) - self.article_cache_max_entries)
+        for _, url in stamped[:drop]:
+            del article_cache[url]
+        if drop:
+            logger.info("🧹 Pruned %d cached article scores", drop)
+    
+    def _process_article(self, article_data: Dict, article_cache=None) -> Optional[Tuple[float, float, float, List[str]]]:
+        """Score raw article data into a (score, magnitude, relevance, key_phrases) record"""
         try:
+            url = article_data.get('url', '')
+            if url and article_cache is not None:
+                cached = article_cache.get(url)
+                if cached is not None:
+                    return cached[1]
+            
             title = article_data.get('title', '')
             description = article_data.get('description', '')
             
             if not title and not description:
                 return None
             
+            # Lowercase once and share the text across all three analyzers
+            # (str.lower already has an ASCII fast path; bytes.translate measured slower)
+            text = f"{title} {description}".lower()
+            
+            # Tokenize once: the count normalizes sentiment, the set drives relevance
+            tokens = self._word_re.findall(text)
+            
             # Calculate sentiment
-            sentiment_score, sentiment_magnitude = self._analyze_sentiment(title, description)
+            sentiment_score, sentiment_magnitude = self._analyze_sentiment(text, len(tokens))
             
             # Calculate relevance to trading
-            relevance_score = self._calculate_relevance(title, description, article_data.get('tags', []))
+            relevance_score = self._calculate_relevance(frozenset(tokens), article_data.get('tags', []))
             
             # Extract key phrases
-            key_phrases = self._extract_key_phrases(title, description)
+            key_phrases = self._extract_key_phrases(text)
             
-            return NewsArticle(
-                title=title,
-                description=description,
-                url=article_data.get('url', ''),
-                published_date=article_data.get('publishedDate', ''),
-                source=article_data.get('source', ''),
-                tickers=article_data.get('tickers', [primary_symbol]),
-                tags=article_data.get('tags', []),
-                sentiment_score=sentiment_score,
-                sentiment_magnitude=sentiment_magnitude,
-                relevance_score=relevance_score,
-                key_phrases=key_phrases
-            )
+            record = (sentiment_score, sentiment_magnitude, relevance_score, key_phrases)
+            if url and article_cache is not None:
+                article_cache[url] = (time.time(), record)
+            
+            return record
             
         except Exception as e:
-            print(f"   ⚠️ Error processing article: {e}")
+            logger.warning("Error processing article: %s", e)
             return None
     
-    def _analyze_sentiment(self, title: str, description: str) -> Tuple[float, float]:
-        """Analyze sentiment of article text"""
-        text = f"{title} {description}".lower()
+    def _analyze_sentiment(self, text: str, word_count: int) -> Tuple[float, float]:
+        """Analyze sentiment of lowercased article text; word_count is its number of word tokens"""
+        # Count positive and negative keywords in one regex scan
+        hits = self._sent_re.findall(text)
         
-        # Count positive and negative keywords
-        positive_score = 0
-        negative_score = 0
-        word_count = 0
-        
-        words = re.findall(r'\b\w+\b', text)
-        word_count = len(words)
-        
-        for word in words:
-            if word in self.positive_keywords:
-                positive_score += self.positive_keywords[word]
-            elif word in self.negative_keywords:
-                negative_score += abs(self.negative_keywords[word])
+        positive_score = sum(self.positive_keywords[w] for w in hits if w in self.positive_keywords)
+        negative_score = sum(abs(self.negative_keywords[w]) for w in hits if w in self.negative_keywords)
         
         # Check for high-impact phrases
-        impact_multiplier = 1.0
-        for phrase, multiplier in self.impact_multipliers.items():
-            if phrase in text:
-                impact_multiplier = max(impact_multiplier, multiplier)
+        impact_ac = self.impact_automaton
+        if impact_ac is not None:
+            impact_multiplier = max((m for _, m in impact_ac.iter(text)), default=1.0)
+        else:
+            impact_multiplier = 1.0
+            for phrase, multiplier in self.impact_multipliers.items():
+                if phrase in text:
+                    impact_multiplier = max(impact_multiplier, multiplier)
         
         # Calculate overall sentiment (-1 to +1)
         if word_count == 0:
@@ -209,24 +438,12 @@ class NewsSentimentPipeline:
         
         return sentiment, magnitude
     
-    def _calculate_relevance(self, title: str, description: str, tags: List[str]) -> float:
-        """Calculate how relevant article is to trading decisions"""
-        text = f"{title} {description}".lower()
+    def _calculate_relevance(self, words: frozenset, tags: List[str]) -> float:
+        """Calculate how relevant an article's word set is to trading decisions"""
         relevance = 0.5  # Base relevance
         
-        # High relevance keywords
-        trading_keywords = [
-            'earnings', 'revenue', 'profit', 'loss', 'guidance', 'forecast',
-            'analyst', 'rating', 'upgrade', 'downgrade', 'target', 'price',
-            'merger', 'acquisition', 'partnership', 'deal', 'contract',
-            'fda', 'approval', 'clinical', 'trial', 'product', 'launch',
-            'ceo', 'management', 'restructuring', 'layoffs', 'hiring',
-            'dividend', 'split', 'buyback', 'debt', 'financing', 'ipo'
-        ]
-        
-        for keyword in trading_keywords:
-            if keyword in text:
-                relevance += 0.1
+        # High relevance keywords (set intersection instead of one text scan per keyword)
+        relevance += 0.1 * len(self.trading_keywords.intersection(words))
         
         # Tag-based relevance
         relevant_tags = ['earnings', 'mergers', 'management', 'products', 'financial']
@@ -236,27 +453,13 @@ class NewsSentimentPipeline:
         
         return min(1.0, relevance)
     
-    def _extract_key_phrases(self, title: str, description: str) -> List[str]:
-        """Extract key phrases from article text"""
-        text = f"{title} {description}".lower()
-        phrases = []
-        
-        # Common trading-relevant phrases
-        key_patterns = [
-            r'earnings\s+beat', r'earnings\s+miss', r'guidance\s+raised', r'guidance\s+lowered',
-            r'analyst\s+upgrade', r'analyst\s+downgrade', r'price\s+target', r'revenue\s+up',
-            r'revenue\s+down', r'profit\s+up', r'profit\s+down', r'new\s+product',
-            r'product\s+launch', r'fda\s+approval', r'merger\s+announced', r'acquisition',
-            r'ceo\s+resigns?', r'new\s+ceo', r'dividend\s+increase', r'stock\s+split'
-        ]
-        
-        for pattern in key_patterns:
-            matches = re.findall(pattern, text)
-            phrases.extend(matches)
+    def _extract_key_phrases(self, text: str) -> List[str]:
+        """Extract key phrases from lowercased article text"""
+        phrases = [match for pattern in self._key_patterns for match in pattern.findall(text)]
         
-        return list(set(phrases))[:5]  # Return top 5 unique phrases
+        return list(dict.fromkeys(phrases))[:5]  # Return first 5 unique phrases, in pattern order
     
-    def calculate_ticker_sentiment(self, symbol: str, articles: List[NewsArticle]) -> TickerSentiment:
+    def calculate_ticker_sentiment(self, symbol: str, articles: ArticleBatch) -> TickerSentiment:
         """Calculate overall sentiment for a ticker from its articles"""
         if not articles:
             return TickerSentiment(
@@ -274,44 +477,20 @@ class NewsSentimentPipeline:
                 confidence=0.0
             )
         
-        # Filter for high-relevance articles
-        relevant_articles = [a for a in articles if a.relevance_score > 0.6]
-        if not relevant_articles:
-            relevant_articles = articles  # Fall back to all articles
-        
-        # Calculate weighted sentiment (recent articles matter more)
-        total_sentiment = 0
-        total_weight = 0
-        
-        for i, article in enumerate(relevant_articles):
-            # Recent articles get higher weight
-            recency_weight = 1.0 - (i / len(relevant_articles)) * 0.5
-            weight = article.sentiment_magnitude * article.relevance_score * recency_weight
-            
-            total_sentiment += article.sentiment_score * weight
-            total_weight += weight
-        
-        overall_sentiment = total_sentiment / total_weight if total_weight > 0 else 0.0
-        
-        # Count article types
-        positive_articles = sum(1 for a in articles if a.sentiment_score > 0.2)
-        negative_articles = sum(1 for a in articles if a.sentiment_score < -0.2)
-        neutral_articles = len(articles) - positive_articles - negative_articles
-        
-        # Calculate sentiment strength
-        sentiment_strength = np.mean([a.sentiment_magnitude for a in articles])
+        # Weighted sentiment, strength, article type counts and trend halves in one reduction
+        n = len(articles)
+        (overall_sentiment, sentiment_strength, positive_articles, negative_articles,
+         recent_sentiment, older_sentiment) = _reduce_sentiment(articles.scores, articles.mags, articles.rels)
+        neutral_articles = n - positive_articles - negative_articles
         
         # Extract key themes
         all_phrases = []
-        for article in articles:
-            all_phrases.extend(article.key_phrases)
-        key_themes = list(set(all_phrases))[:5]
+        for phrases in articles.key_phrases:
+            all_phrases.extend(phrases)
+        key_themes = list(dict.fromkeys(all_phrases))[:5]
         
         # Determine sentiment trend (simplified)
-        if len(articles) >= 3:
-            recent_sentiment = np.mean([a.sentiment_score for a in articles[:len(articles)//2]])
-            older_sentiment = np.mean([a.sentiment_score for a in articles[len(articles)//2:]])
-            
+        if n >= 3:
             if recent_sentiment > older_sentiment + 0.1:
                 sentiment_trend = "improving"
             elif recent_sentiment < older_sentiment - 0.1:
@@ -341,7 +520,7 @@ class NewsSentimentPipeline:
             negative_articles=negative_articles,
             neutral_articles=neutral_articles,
             key_themes=key_themes,
-            recent_news=articles[:3],  # Top 3 most recent
+            recent_news=[articles.article(i) for i in range(min(3, n))],  # Top 3 most recent
             sentiment_trend=sentiment_trend,
             trading_signal=trading_signal,
             confidence=round(confidence, 1)
@@ -349,10 +528,11 @@ class NewsSentimentPipeline:
     
     def analyze_market_sentiment(self, symbols: List[str], days_back: int = 7) -> Dict[str, TickerSentiment]:
         """Comprehensive sentiment analysis for multiple symbols"""
-        print(f"\n🧠 MARKET SENTIMENT ANALYSIS")
-        print(f"   📊 Symbols: {len(symbols)}")
-        print(f"   📅 Period: {days_back} days")
-        print("=" * 60)
+        if self.verbose:
+            print(f"\n🧠 MARKET SENTIMENT ANALYSIS")
+            print(f"   📊 Symbols: {len(symbols)}")
+            print(f"   📅 Period: {days_back} days")
+            print("=" * 60)
         
         # Step 1: Collect news for all symbols
         symbol_news = self.get_news_for_symbols(symbols, days_back)
@@ -364,7 +544,7 @@ class NewsSentimentPipeline:
             sentiment = self.calculate_ticker_sentiment(symbol, articles)
             sentiment_results[symbol] = sentiment
             
-            if articles:
+            if articles and self.verbose:
                 signal_emoji = "🟢" if sentiment.trading_signal == "bullish" else "🔴" if sentiment.trading_signal == "bearish" else "🟡"
                 trend_emoji = "📈" if sentiment.sentiment_trend == "improving" else "📉" if sentiment.sentiment_trend == "declining" else "➡️"
                 
@@ -393,19 +573,22 @@ class NewsSentimentPipeline:
         print(f"\n📊 MARKET SENTIMENT REPORT")
         print("=" * 70)
         
-        # Overall market mood
-        all_sentiments = [s.overall_sentiment for s in sentiment_results.values() if s.article_count > 0]
-        if all_sentiments:
-            market_sentiment = np.mean(all_sentiments)
-            market_mood = "Bullish" if market_sentiment > 0.1 else "Bearish" if market_sentiment < -0.1 else "Neutral"
-            print(f"📈 Overall Market Mood: {market_mood} ({market_sentiment:+.2f})")
-        
-        # Signal distribution
+        # Market mood and signal distribution in a single pass
+        sentiment_total = 0.0
+        covered = 0
         signal_counts = {"bullish": 0, "bearish": 0, "neutral": 0}
         for sentiment in sentiment_results.values():
             if sentiment.article_count > 0:
+                sentiment_total += sentiment.overall_sentiment
+                covered += 1
                 signal_counts[sentiment.trading_signal] += 1
         
+        # Overall market mood
+        if covered:
+            market_sentiment = sentiment_total / covered
+            market_mood = "Bullish" if market_sentiment > 0.1 else "Bearish" if market_sentiment < -0.1 else "Neutral"
+            print(f"📈 Overall Market Mood: {market_mood} ({market_sentiment:+.2f})")
+        
         print(f"\n🎯 TRADING SIGNALS:")
         print(f"   🟢 Bullish: {signal_counts['bullish']} stocks")
         print(f"   🔴 Bearish: {signal_counts['bearish']} stocks")
@@ -427,6 +610,16 @@ class NewsSentimentPipeline:
                 print(f"   {i}. {sentiment.symbol}: {sentiment.confidence:.0f}% confidence")
                 print(f"      Sentiment: {sentiment.overall_sentiment:+.2f} | Trend: {sentiment.sentiment_trend}")
     
+    @staticmethod
+    def _sentiment_to_dict(sentiment: TickerSentiment) -> Dict:
+        """Shallow dict for JSON export (avoids asdict's recursive deep copy)"""
+        data = {f.name: getattr(sentiment, f.name) for f in fields(sentiment)}
+        data['recent_news'] = [
+            {'title': a.title, 'url': a.url, 'published_date': a.published_date}
+            for a in sentiment.recent_news
+        ]
+        return data
+    
     def save_sentiment_analysis(self, sentiment_results: Dict[str, TickerSentiment], 
                               filename: str = None):
         """Save sentiment analysis results"""
@@ -441,25 +634,23 @@ class NewsSentimentPipeline:
         with open(json_file, 'w') as f:
             json.dump({
                 'analysis_timestamp': datetime.now().isoformat(),
-                'sentiment_results': {k: asdict(v) for k, v in sentiment_results.items()}
+                'sentiment_results': {k: self._sentiment_to_dict(v) for k, v in sentiment_results.items()}
             }, f, indent=2, default=str)
         
         # Save as CSV
         csv_file = f"data/sentiment_analysis/{filename}.csv"
-        df_data = []
-        for symbol, sentiment in sentiment_results.items():
-            df_data.append({
-                'symbol': symbol,
-                'overall_sentiment': sentiment.overall_sentiment,
-                'sentiment_strength': sentiment.sentiment_strength,
-                'trading_signal': sentiment.trading_signal,
-                'confidence': sentiment.confidence,
-                'article_count': sentiment.article_count,
-                'sentiment_trend': sentiment.sentiment_trend,
-                'key_themes': '; '.join(sentiment.key_themes)
-            })
-        
-        df = pd.DataFrame(df_data)
+        results = list(sentiment_results.values())
+        n = len(results)
+        df = pd.DataFrame({
+            'symbol': list(sentiment_results.keys()),
+            'overall_sentiment': np.fromiter((r.overall_sentiment for r in results), dtype=np.float64, count=n),
+            'sentiment_strength': np.fromiter((r.sentiment_strength for r in results), dtype=np.float64, count=n),
+            'trading_signal': [r.trading_signal for r in results],
+            'confidence': np.fromiter((r.confidence for r in results), dtype=np.float64, count=n),
+            'article_count': np.fromiter((r.article_count for r in results), dtype=np.int64, count=n),
+            'sentiment_trend': [r.sentiment_trend for r in results],
+            'key_themes': ['; '.join(r.key_themes) for r in results]
+        }, copy=False)
         df.to_csv(csv_file, index=False)
         
         print(f"\n💾 SENTIMENT ANALYSIS SAVED:")
@@ -468,6 +659,7 @@ class NewsSentimentPipeline:
 
 def main():
     """Test news sentiment pipeline"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     pipeline = NewsSentimentPipeline()
     
     # Test with popular stocks
@@ -6,20 +6,175 @@ Efficient API usage with caching + Tiingo/Yahoo fallback
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Optional
 import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from smart_data_manager import SmartDataManager
 
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _rsi_last_loop(close, period=14):
+    """RSI of the last bar from simple `period`-bar averages of gains and losses
+    
+    Matches the pandas diff/where/rolling(period).mean() chain, where the
+    leading NaN delta counts as zero.
+    """
+    n = close.shape[0]
+    if n == 0:
+        return 50.0
+    if n < period:
+        return np.nan
+    gain = 0.0
+    loss = 0.0
+    for i in range(max(n - period, 1), n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+    if loss == 0.0:
+        return 100.0 if gain > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+def _rsi_last_numpy(close, period=14):
+    """Vectorized `_rsi_last_loop` for environments without numba"""
+    # Only the last window matters for a simple average, so this stays O(period);
+    # a Wilder (RMA) filter would run over the whole history and change the signal
+    if close.size == 0:
+        return 50.0
+    if close.size < period:
+        return np.nan
+    tail = close[-(period + 1):]
+    deltas = np.diff(tail, prepend=tail[0])
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    gain = sliding_window_view(gains, period)[-1].sum()
+    loss = sliding_window_view(losses, period)[-1].sum()
+    if loss == 0.0:
+        return 100.0 if gain > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+_rsi_last = njit(cache=True)(_rsi_last_loop) if njit else _rsi_last_numpy
+
+def _resolve_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    """Map Tiingo (lowercase) or Yahoo (capitalized) price columns; volume is None if absent"""
+    columns = set(df.columns)
+    return {
+        'close': 'Close' if 'Close' in columns else 'close',
+        'volume': 'Volume' if 'Volume' in columns else ('volume' if 'volume' in columns else None)
+    }
+
+def _precompute_indicators(df: pd.DataFrame, col_map: Dict[str, Optional[str]], current_price: float) -> Dict:
+    """Compute the price/volume indicators shared by all agents once per symbol"""
+    # One C-contiguous float64 buffer per column keeps every reduction below on numpy's fast path.
+    # Price frames arrive as float64, so this is zero-copy; a float32 cast would add a copy per column
+    # and shift threshold comparisons without any bandwidth win on a few hundred rows.
+    close_np = np.ascontiguousarray(df[col_map['close']].to_numpy(dtype=np.float64, copy=False))
+    vol_np = (np.ascontiguousarray(df[col_map['volume']].to_numpy(dtype=np.float64, copy=False))
+              if col_map['volume'] else None)
+    
+    # Moving averages, RSI and momentum (technical agent)
+    indicators = {
+        'sma10': close_np[-10:].mean(),
+        'sma20': close_np[-20:].mean(),
+        'sma50': close_np[-50:].mean(),
+        'rsi14': _rsi_last(close_np),
+        'price_change_5d': ((current_price - close_np[-6]) / close_np[-6]) * 100 if len(close_np) >= 6 else 0,
+        'vol_trend': None,
+        'dollar_vol_20': None,
+        'px_52w_hi': None,
+        'px_52w_lo': None
+    }
+    
+    # Volume trend and liquidity
+    if vol_np is not None:
+        avg_volume = vol_np[-20:].mean()
+        indicators['vol_trend'] = vol_np[-5:].mean() / avg_volume if avg_volume > 0 else 1
+        indicators['dollar_vol_20'] = (close_np[-20:] * vol_np[-20:]).mean()
+    
+    # 30-day rolling drawdown
+    if close_np.size >= 30:
+        rolling_max = sliding_window_view(close_np, 30).max(axis=1)
+        drawdown = (close_np[29:] - rolling_max) / rolling_max * 100.0
+        indicators['max_dd_30'] = drawdown.min()
+    else:
+        indicators['max_dd_30'] = np.nan
+    
+    # Days with >5% moves over the last 30 sessions
+    window = close_np[-31:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_changes = np.diff(window) / window[:-1]
+    indicators['extreme_moves'] = int((np.abs(price_changes) > 0.05).sum())
+    
+    # 52-week range (full year of data only)
+    if close_np.size >= 252:
+        year = close_np[-252:]
+        indicators['px_52w_hi'] = year.max()
+        indicators['px_52w_lo'] = year.min()
+    
+    return indicators
+
+# Agents record reasons as (code, value) pairs; the text is only built when it is read
+_REASONS = (
+    ('no_data', "No data available"),
+    ('neutral_value', "Neutral signals"),
+    ('oversold_sma50', "Oversold vs 50-day SMA ({:.1f}%)"),
+    ('expensive_sma50', "Expensive vs 50-day SMA ({:.1f}%)"),
+    ('stable_volatility', "Stable volatility ({:.1f}%)"),
+    ('high_volatility', "High volatility ({:.1f}%)"),
+    ('low_volume', "Low volume ({:.1f}x)"),
+    ('high_volume', "High volume interest ({:.1f}x)"),
+    ('attractive_pe', "Attractive P/E ({:.1f})"),
+    ('high_pe', "High P/E ({:.1f})"),
+    ('strong_dividend', "Strong dividend ({:.1f}%)"),
+    ('no_technical_data', "No technical data available"),
+    ('neutral_technical', "Neutral technical signals"),
+    ('strong_uptrend', "Strong uptrend (price > all MAs)"),
+    ('strong_downtrend', "Strong downtrend (price < all MAs)"),
+    ('above_sma20', "Above 20-day MA"),
+    ('below_sma20', "Below 20-day MA"),
+    ('oversold_rsi', "Oversold RSI ({:.1f})"),
+    ('overbought_rsi', "Overbought RSI ({:.1f})"),
+    ('strong_volume', "Strong volume ({:.1f}x)"),
+    ('weak_volume', "Weak volume ({:.1f}x)"),
+    ('strong_momentum', "Strong 5-day momentum (+{:.1f}%)"),
+    ('weak_momentum', "Weak 5-day momentum ({:.1f}%)"),
+    ('no_risk_data', "No risk data available"),
+    ('normal_risk', "Normal risk levels"),
+    ('very_high_volatility', "Very high volatility ({:.1f}%)"),
+    ('low_volatility', "Low volatility ({:.1f}%)"),
+    ('severe_drawdown', "Severe drawdown ({:.1f}%)"),
+    ('moderate_drawdown', "Moderate drawdown ({:.1f}%)"),
+    ('low_liquidity', "Low liquidity risk"),
+    ('high_liquidity', "High liquidity (low risk)"),
+    ('extreme_moves', "{} extreme moves (30d)"),
+    ('near_52w_high', "Near 52-week high"),
+    ('near_52w_low', "Near 52-week low (some risk)")
+)
+_REASON_TABLE: List[str] = [template for _, template in _REASONS]
+_REASON: Dict[str, int] = {name: code for code, (name, _) in enumerate(_REASONS)}
+
+def _format_reasons(reasoning_codes: tuple) -> str:
+    """Render (code, value) reason pairs as '; '-separated text"""
+    return "; ".join(_REASON_TABLE[code].format(value) for code, value in reasoning_codes)
+
 @dataclass
 class OptimizedTradingRecommendation:
     symbol: str
     action: str  # BUY, SELL, HOLD
     confidence: float  # 0-100
     target_price: Optional[float]
-    reasoning: str
+    reasoning_codes: tuple  # (value, technical, risk) agents' (code, value) reason pairs
     agent_votes: Dict[str, str]  # Which agents voted for what
     data_quality: str
     data_source: str  # tiingo or yahoo
@@ -27,53 +182,164 @@ class OptimizedTradingRecommendation:
     fundamental_score: Optional[float]  # 0-100 if fundamentals available
     technical_score: float  # 0-100
     market_timing_score: float  # 0-100
+    
+    @property
+    def reasoning(self) -> str:
+        """Consensus reasoning text, rendered from the agents' reason codes on access"""
+        value_codes, technical_codes, risk_codes = self.reasoning_codes
+        if self.risk_score > 70:
+            return f"High risk override: {_format_reasons(risk_codes)}"
+        return " | ".join([
+            f"Value: {_format_reasons(value_codes)}",
+            f"Technical: {_format_reasons(technical_codes)}",
+            f"Risk: {_format_reasons(risk_codes)}"
+        ])
+
+@dataclass
+class RecommendationTable:
+    """Column-wise (one array per field) view of a batch of recommendations"""
+    symbols: np.ndarray
+    action: np.ndarray
+    confidence: np.ndarray
+    target_price: np.ndarray  # NaN where no target
+    reasoning_codes: np.ndarray
+    agent_votes: np.ndarray
+    data_quality: np.ndarray
+    data_source: np.ndarray
+    risk_score: np.ndarray
+    fundamental_score: np.ndarray  # NaN where fundamentals unavailable
+    technical_score: np.ndarray
+    market_timing_score: np.ndarray
+    
+    @classmethod
+    def from_recommendations(cls, recommendations: List[OptimizedTradingRecommendation]) -> 'RecommendationTable':
+        """Build the columns from a list of per-symbol recommendations"""
+        def column(field, dtype=object):
+            values = [getattr(rec, field) for rec in recommendations]
+            if dtype is object:
+                # Fill element-wise so tuples/dicts stay single cells
+                cells = np.empty(len(values), dtype=object)
+                cells[:] = values
+                return cells
+            return np.asarray(values, dtype=dtype)
+        
+        def optional_column(field):
+            values = [getattr(rec, field) for rec in recommendations]
+            return np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+        
+        return cls(
+            symbols=column('symbol', str),
+            action=column('action', str),
+            confidence=column('confidence', np.float64),
+            target_price=optional_column('target_price'),
+            reasoning_codes=column('reasoning_codes'),
+            agent_votes=column('agent_votes'),
+            data_quality=column('data_quality'),
+            data_source=column('data_source'),
+            risk_score=column('risk_score', np.float64),
+            fundamental_score=optional_column('fundamental_score'),
+            technical_score=column('technical_score', np.float64),
+            market_timing_score=column('market_timing_score', np.float64)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def __getitem__(self, i: int) -> OptimizedTradingRecommendation:
+        """Materialize row i as an OptimizedTradingRecommendation"""
+        target_price = self.target_price[i]
+        fundamental_score = self.fundamental_score[i]
+        return OptimizedTradingRecommendation(
+            symbol=str(self.symbols[i]),
+            action=str(self.action[i]),
+            confidence=float(self.confidence[i]),
+            target_price=None if np.isnan(target_price) else float(target_price),
+            reasoning_codes=self.reasoning_codes[i],
+            agent_votes=self.agent_votes[i],
+            data_quality=self.data_quality[i],
+            data_source=self.data_source[i],
+            risk_score=float(self.risk_score[i]),
+            fundamental_score=None if np.isnan(fundamental_score) else float(fundamental_score),
+            technical_score=float(self.technical_score[i]),
+            market_timing_score=float(self.market_timing_score[i])
+        )
+    
+    def ranked_by_confidence(self) -> np.ndarray:
+        """Row indices ordered from highest to lowest confidence"""
+        return np.argsort(-self.confidence, kind='stable')
+
+def _compile_band_classifier(bands: tuple):
+    """Generate a classifier with the band thresholds inlined as literals (jitted when numba is available)
+    
+    Returns f(*metric_values) -> tuple of band indices (0 = below, 1 = neutral, 2 = above).
+    """
+    args = [f"v{i}" for i in range(len(bands))]
+    terms = [f"0 if {arg} < {low!r} else 2 if {arg} > {high!r} else 1"
+             for arg, (_, low, _, _, high, _, _) in zip(args, bands)]
+    source = f"def classify({', '.join(args)}):\n    return ({', '.join(terms)},)\n"
+    namespace = {}
+    exec(source, namespace)
+    classify = namespace['classify']
+    return njit(classify) if njit else classify
 
 class OptimizedValueAgent:
     """Value analysis with shared data from SmartDataManager"""
     
+    # (metric, below, delta, reason, above, delta, reason) - strict thresholds, middle band scores 0
+    _MARKET_BANDS = (
+        ('price_vs_sma50', -10, 15, _REASON['oversold_sma50'], 20, -10, _REASON['expensive_sma50']),
+        ('volatility_30d', 20, 5, _REASON['stable_volatility'], 40, -5, _REASON['high_volatility']),
+        ('volume_ratio', 0.5, -3, _REASON['low_volume'], 1.5, 8, _REASON['high_volume'])
+    )
+    
+    _classify_bands = staticmethod(_compile_band_classifier(_MARKET_BANDS))
+    
     def __init__(self, name: str = "Optimized Value Agent"):
         self.name = name
+    
+    @classmethod
+    def classify_market_bands(cls, metrics) -> np.ndarray:
+        """Band index per rule (0 = below, 1 = neutral, 2 = above) for scalar or column metrics"""
+        bands = []
+        for key, low, _, _, high, _, _ in cls._MARKET_BANDS:
+            values = np.asarray(metrics[key], dtype=np.float64)
+            bands.append(np.select([values < low, values > high], [0, 2], default=1))
+        return np.stack(bands)
+    
+    @classmethod
+    def score_market_batch(cls, metrics: pd.DataFrame) -> np.ndarray:
+        """Momentum/volatility/volume score for every row of a metrics frame in one pass per rule"""
+        bands = cls.classify_market_bands(metrics)
+        deltas = np.array([[low_delta, 0, high_delta] for _, _, low_delta, _, _, high_delta, _ in cls._MARKET_BANDS])
+        return 50 + np.take_along_axis(deltas, bands, axis=1).sum(axis=0)
         
     def analyze(self, symbol: str, stock_data: Dict, fundamentals: Dict = None, 
                enhanced_metrics: Dict = None) -> Dict:
         """Analyze using pre-fetched data (no API calls)"""
-        print(f"💎 {self.name} analyzing {symbol} (using cached data)...")
+        logger.debug("%s analyzing %s (using cached data)", self.name, symbol)
         
         if not stock_data or not enhanced_metrics:
             return {
                 'recommendation': 'HOLD',
                 'confidence': 0,
-                'reasoning': 'No data available',
+                'reasoning_codes': ((_REASON['no_data'], None),),
                 'score': 50
             }
         
-        current_price = enhanced_metrics['current_price']
         score = 50  # Start neutral
         reasoning_parts = []
         
-        # Price momentum analysis
-        if enhanced_metrics['price_vs_sma50'] < -10:
-            score += 15
-            reasoning_parts.append(f"Oversold vs 50-day SMA ({enhanced_metrics['price_vs_sma50']:.1f}%)")
-        elif enhanced_metrics['price_vs_sma50'] > 20:
-            score -= 10
-            reasoning_parts.append(f"Expensive vs 50-day SMA ({enhanced_metrics['price_vs_sma50']:.1f}%)")
-        
-        # Volatility assessment
-        if enhanced_metrics['volatility_30d'] > 40:
-            score -= 5
-            reasoning_parts.append(f"High volatility ({enhanced_metrics['volatility_30d']:.1f}%)")
-        elif enhanced_metrics['volatility_30d'] < 20:
-            score += 5
-            reasoning_parts.append(f"Stable volatility ({enhanced_metrics['volatility_30d']:.1f}%)")
-        
-        # Volume analysis
-        if enhanced_metrics['volume_ratio'] > 1.5:
-            score += 8
-            reasoning_parts.append(f"High volume interest ({enhanced_metrics['volume_ratio']:.1f}x)")
-        elif enhanced_metrics['volume_ratio'] < 0.5:
-            score -= 3
-            reasoning_parts.append(f"Low volume ({enhanced_metrics['volume_ratio']:.1f}x)")
+        # Momentum, volatility and volume bands (each metric looked up once)
+        metric_values = [enhanced_metrics[rule[0]] for rule in self._MARKET_BANDS]
+        bands = self._classify_bands(*metric_values)
+        for (_, _, low_delta, low_code, _, high_delta, high_code), band, value in zip(
+                self._MARKET_BANDS, bands, metric_values):
+            if band == 0:
+                score += low_delta
+                reasoning_parts.append((low_code, value))
+            elif band == 2:
+                score += high_delta
+                reasoning_parts.append((high_code, value))
         
         # Fundamental analysis (if available from Tiingo)
         fundamental_score = None
@@ -88,22 +354,22 @@ class OptimizedValueAgent:
                         pe_ratio = recent_metrics['trailingPE']
                         if pe_ratio and 0 < pe_ratio < 15:
                             score += 10
-                            reasoning_parts.append(f"Attractive P/E ({pe_ratio:.1f})")
+                            reasoning_parts.append((_REASON['attractive_pe'], pe_ratio))
                         elif pe_ratio and pe_ratio > 30:
                             score -= 8
-                            reasoning_parts.append(f"High P/E ({pe_ratio:.1f})")
+                            reasoning_parts.append((_REASON['high_pe'], pe_ratio))
                     
                     # Dividend yield
                     if 'dividendYield' in recent_metrics:
                         div_yield = recent_metrics['dividendYield']
                         if div_yield and div_yield > 0.03:  # 3%+
                             score += 5
-                            reasoning_parts.append(f"Strong dividend ({div_yield*100:.1f}%)")
+                            reasoning_parts.append((_REASON['strong_dividend'], div_yield * 100))
                     
                     fundamental_score = min(100, max(0, score))
                     
             except Exception as e:
-                print(f"   ⚠️ Fundamental analysis error: {e}")
+                logger.warning("Fundamental analysis error for %s: %s", symbol, e)
         
         # Determine recommendation
         if score >= 70:
@@ -116,14 +382,14 @@ class OptimizedValueAgent:
             recommendation = 'HOLD'
             confidence = 50
         
-        reasoning = "; ".join(reasoning_parts) if reasoning_parts else "Neutral signals"
+        reasoning_codes = tuple(reasoning_parts) or ((_REASON['neutral_value'], None),)
         
-        print(f"   📊 Score: {score}/100 | Recommendation: {recommendation}")
+        logger.debug("%s score: %s/100 | Recommendation: %s", symbol, score, recommendation)
         
         return {
             'recommendation': recommendation,
             'confidence': confidence,
-            'reasoning': reasoning,
+            'reasoning_codes': reasoning_codes,
             'score': score,
             'fundamental_score': fundamental_score
         }
@@ -136,84 +402,68 @@ class OptimizedTechnicalAgent:
         
     def analyze(self, symbol: str, stock_data: Dict, enhanced_metrics: Dict = None) -> Dict:
         """Analyze using pre-fetched data (no API calls)"""
-        print(f"📈 {self.name} analyzing {symbol} (using cached data)...")
+        logger.debug("%s analyzing %s (using cached data)", self.name, symbol)
         
         if not stock_data or not enhanced_metrics:
             return {
                 'recommendation': 'HOLD',
                 'confidence': 0,
-                'reasoning': 'No technical data available',
+                'reasoning_codes': ((_REASON['no_technical_data'], None),),
                 'score': 50
             }
         
-        df = stock_data['price_data']
         current_price = enhanced_metrics['current_price']
         
-        # Handle column name differences (Tiingo vs Yahoo)
-        close_col = 'Close' if 'Close' in df.columns else 'close'
-        volume_col = 'Volume' if 'Volume' in df.columns else 'volume'
-        
         score = 50
         reasoning_parts = []
         
-        # Moving average analysis
-        sma_10 = df[close_col].tail(10).mean()
-        sma_20 = df[close_col].tail(20).mean()
-        sma_50 = df[close_col].tail(50).mean()
+        # Moving average analysis (indicators precomputed once per symbol)
+        sma_10 = enhanced_metrics['sma10']
+        sma_20 = enhanced_metrics['sma20']
+        sma_50 = enhanced_metrics['sma50']
         
         # Trend analysis
         if current_price > sma_10 > sma_20 > sma_50:
             score += 20
-            reasoning_parts.append("Strong uptrend (price > all MAs)")
+            reasoning_parts.append((_REASON['strong_uptrend'], None))
         elif current_price < sma_10 < sma_20 < sma_50:
             score -= 20
-            reasoning_parts.append("Strong downtrend (price < all MAs)")
+            reasoning_parts.append((_REASON['strong_downtrend'], None))
         elif current_price > sma_20:
             score += 10
-            reasoning_parts.append("Above 20-day MA")
+            reasoning_parts.append((_REASON['above_sma20'], None))
         elif current_price < sma_20:
             score -= 10
-            reasoning_parts.append("Below 20-day MA")
+            reasoning_parts.append((_REASON['below_sma20'], None))
         
-        # RSI calculation
-        delta = df[close_col].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        current_rsi = rsi.iloc[-1] if not rsi.empty else 50
+        # RSI
+        current_rsi = enhanced_metrics['rsi14']
         
         if current_rsi < 30:
             score += 15
-            reasoning_parts.append(f"Oversold RSI ({current_rsi:.1f})")
+            reasoning_parts.append((_REASON['oversold_rsi'], current_rsi))
         elif current_rsi > 70:
             score -= 15
-            reasoning_parts.append(f"Overbought RSI ({current_rsi:.1f})")
+            reasoning_parts.append((_REASON['overbought_rsi'], current_rsi))
         
         # Volume confirmation
-        if volume_col in df.columns:
-            avg_volume = df[volume_col].tail(20).mean()
-            recent_volume = df[volume_col].tail(5).mean()
-            volume_trend = recent_volume / avg_volume if avg_volume > 0 else 1
-            
+        volume_trend = enhanced_metrics['vol_trend']
+        if volume_trend is not None:
             if volume_trend > 1.5:
                 score += 8
-                reasoning_parts.append(f"Strong volume ({volume_trend:.1f}x)")
+                reasoning_parts.append((_REASON['strong_volume'], volume_trend))
             elif volume_trend < 0.7:
                 score -= 5
-                reasoning_parts.append(f"Weak volume ({volume_trend:.1f}x)")
+                reasoning_parts.append((_REASON['weak_volume'], volume_trend))
         
         # Price momentum
-        if len(df) >= 6:
-            price_change_5d = ((current_price - df[close_col].iloc[-6]) / df[close_col].iloc[-6]) * 100
-            if price_change_5d > 5:
-                score += 10
-                reasoning_parts.append(f"Strong 5-day momentum (+{price_change_5d:.1f}%)")
-            elif price_change_5d < -5:
-                score -= 10
-                reasoning_parts.append(f"Weak 5-day momentum ({price_change_5d:.1f}%)")
-        else:
-            price_change_5d = 0
+        price_change_5d = enhanced_metrics['price_change_5d']
+        if price_change_5d > 5:
+            score += 10
+            reasoning_parts.append((_REASON['strong_momentum'], price_change_5d))
+        elif price_change_5d < -5:
+            score -= 10
+            reasoning_parts.append((_REASON['weak_momentum'], price_change_5d))
         
         # Determine recommendation
         if score >= 70:
@@ -226,14 +476,14 @@ class OptimizedTechnicalAgent:
             recommendation = 'HOLD'
             confidence = 50
         
-        reasoning = "; ".join(reasoning_parts) if reasoning_parts else "Neutral technical signals"
+        reasoning_codes = tuple(reasoning_parts) or ((_REASON['neutral_technical'], None),)
         
-        print(f"   📊 Score: {score}/100 | RSI: {current_rsi:.1f} | Recommendation: {recommendation}")
+        logger.debug("%s score: %s/100 | RSI: %.1f | Recommendation: %s", symbol, score, current_rsi, recommendation)
         
         return {
             'recommendation': recommendation,
             'confidence': confidence,
-            'reasoning': reasoning,
+            'reasoning_codes': reasoning_codes,
             'score': score,
             'rsi': current_rsi,
             'price_change_5d': price_change_5d
@@ -247,20 +497,16 @@ class OptimizedRiskManager:
         
     def analyze(self, symbol: str, stock_data: Dict, enhanced_metrics: Dict = None) -> Dict:
         """Analyze using pre-fetched data (no API calls)"""
-        print(f"⚠️ {self.name} analyzing {symbol} (using cached data)...")
+        logger.debug("%s analyzing %s (using cached data)", self.name, symbol)
         
         if not stock_data or not enhanced_metrics:
             return {
                 'recommendation': 'HOLD',
                 'confidence': 50,
-                'reasoning': 'No risk data available',
+                'reasoning_codes': ((_REASON['no_risk_data'], None),),
                 'risk_score': 50
             }
         
-        df = stock_data['price_data']
-        close_col = 'Close' if 'Close' in df.columns else 'close'
-        volume_col = 'Volume' if 'Volume' in df.columns else 'volume'
-        
         risk_score = 0
         reasoning_parts = []
         
@@ -268,56 +514,52 @@ class OptimizedRiskManager:
         volatility = enhanced_metrics['volatility_30d']
         if volatility > 50:
             risk_score += 30
-            reasoning_parts.append(f"Very high volatility ({volatility:.1f}%)")
+            reasoning_parts.append((_REASON['very_high_volatility'], volatility))
         elif volatility > 30:
             risk_score += 20
-            reasoning_parts.append(f"High volatility ({volatility:.1f}%)")
+            reasoning_parts.append((_REASON['high_volatility'], volatility))
         elif volatility < 15:
             risk_score += 5
-            reasoning_parts.append(f"Low volatility ({volatility:.1f}%)")
+            reasoning_parts.append((_REASON['low_volatility'], volatility))
         
         # Drawdown analysis
-        rolling_max = df[close_col].rolling(window=30).max()
-        drawdown = ((df[close_col] - rolling_max) / rolling_max) * 100
-        max_drawdown_30d = drawdown.min()
+        max_drawdown_30d = enhanced_metrics['max_dd_30']
         
         if max_drawdown_30d < -20:
             risk_score += 25
-            reasoning_parts.append(f"Severe drawdown ({max_drawdown_30d:.1f}%)")
+            reasoning_parts.append((_REASON['severe_drawdown'], max_drawdown_30d))
         elif max_drawdown_30d < -10:
             risk_score += 15
-            reasoning_parts.append(f"Moderate drawdown ({max_drawdown_30d:.1f}%)")
+            reasoning_parts.append((_REASON['moderate_drawdown'], max_drawdown_30d))
         
         # Volume liquidity risk
-        if volume_col in df.columns:
-            avg_dollar_volume = (df[close_col] * df[volume_col]).tail(20).mean()
+        avg_dollar_volume = enhanced_metrics['dollar_vol_20']
+        if avg_dollar_volume is not None:
             if avg_dollar_volume < 1000000:  # $1M daily
                 risk_score += 20
-                reasoning_parts.append("Low liquidity risk")
+                reasoning_parts.append((_REASON['low_liquidity'], None))
             elif avg_dollar_volume > 100000000:  # $100M daily
                 risk_score -= 5
-                reasoning_parts.append("High liquidity (low risk)")
+                reasoning_parts.append((_REASON['high_liquidity'], None))
         
         # Price stability
-        price_changes = df[close_col].pct_change().tail(30)
-        extreme_moves = (abs(price_changes) > 0.05).sum()  # Days with >5% moves
+        extreme_moves = enhanced_metrics['extreme_moves']  # Days with >5% moves
         if extreme_moves > 10:
             risk_score += 15
-            reasoning_parts.append(f"{extreme_moves} extreme moves (30d)")
+            reasoning_parts.append((_REASON['extreme_moves'], extreme_moves))
         
         # Market timing risk
         current_price = enhanced_metrics['current_price']
-        if len(df) >= 252:  # Full year of data
-            price_52w_high = df[close_col].tail(252).max()
-            price_52w_low = df[close_col].tail(252).min()
-            
+        price_52w_high = enhanced_metrics['px_52w_hi']
+        price_52w_low = enhanced_metrics['px_52w_lo']
+        if price_52w_high is not None:  # Full year of data
             price_position = (current_price - price_52w_low) / (price_52w_high - price_52w_low)
             if price_position > 0.9:  # Near 52-week high
                 risk_score += 10
-                reasoning_parts.append("Near 52-week high")
+                reasoning_parts.append((_REASON['near_52w_high'], None))
             elif price_position < 0.1:  # Near 52-week low
                 risk_score += 5
-                reasoning_parts.append("Near 52-week low (some risk)")
+                reasoning_parts.append((_REASON['near_52w_low'], None))
         
         # Determine risk-adjusted recommendation
         if risk_score > 60:
@@ -330,19 +572,50 @@ class OptimizedRiskManager:
             recommendation = 'BUY'   # Low risk
             confidence = 70
         
-        reasoning = "; ".join(reasoning_parts) if reasoning_parts else "Normal risk levels"
+        reasoning_codes = tuple(reasoning_parts) or ((_REASON['normal_risk'], None),)
         
-        print(f"   📊 Risk Score: {risk_score}/100 | Recommendation: {recommendation}")
+        logger.debug("%s risk score: %s/100 | Recommendation: %s", symbol, risk_score, recommendation)
         
         return {
             'recommendation': recommendation,
             'confidence': confidence,
-            'reasoning': reasoning,
+            'reasoning_codes': reasoning_codes,
             'risk_score': risk_score,
             'volatility': volatility,
             'max_drawdown_30d': max_drawdown_30d
         }
 
+@dataclass
+class AgentOutputArrays:
+    """Preallocated per-symbol agent outputs read by the batched consensus step"""
+    votes: np.ndarray  # (n, 3) value / technical / risk actions
+    vote_confidence: np.ndarray  # (n, 2) value / technical confidence
+    risk_score: np.ndarray
+    current_price: np.ndarray  # NaN when the symbol has no price
+    filled: np.ndarray  # False for symbols skipped for lack of data
+    
+    @classmethod
+    def allocate(cls, n_symbols: int) -> 'AgentOutputArrays':
+        """Allocate one slot per symbol"""
+        return cls(
+            votes=np.empty((n_symbols, 3), dtype='U4'),
+            vote_confidence=np.empty((n_symbols, 2)),
+            risk_score=np.empty(n_symbols),
+            current_price=np.full(n_symbols, np.nan),
+            filled=np.zeros(n_symbols, dtype=bool)
+        )
+    
+    def record(self, idx: int, value_analysis: Dict, technical_analysis: Dict, risk_analysis: Dict,
+               current_price: Optional[float]):
+        """Write one symbol's agent outputs into slot `idx`"""
+        self.votes[idx] = (value_analysis['recommendation'], technical_analysis['recommendation'],
+                           risk_analysis['recommendation'])
+        self.vote_confidence[idx] = (value_analysis['confidence'], technical_analysis['confidence'])
+        self.risk_score[idx] = risk_analysis['risk_score']
+        if current_price is not None:
+            self.current_price[idx] = current_price
+        self.filled[idx] = True
+
 class OptimizedMultiAgentTradingSystem:
     """Optimized multi-agent system with efficient data usage"""
     
@@ -351,12 +624,44 @@ class OptimizedMultiAgentTradingSystem:
         self.value_agent = OptimizedValueAgent()
         self.technical_agent = OptimizedTechnicalAgent()
         self.risk_manager = OptimizedRiskManager()
+        self.recommendation_table: Optional[RecommendationTable] = None
         
         print("🚀 Optimized Multi-Agent Trading System Initialized")
         print("   💡 Smart caching: Minimize API calls")
         print("   🔄 Fallback: Tiingo → Yahoo when limits hit")
         print("   📊 Efficient: Shared data between agents")
         
+    def _analyze_one(self, symbol: str, batch_data: Dict, idx: int, outputs: AgentOutputArrays) -> tuple:
+        """Run all agents for one symbol on the cached batch data; consensus happens batch-wide"""
+        if symbol not in batch_data:
+            logger.warning("No data available for %s, skipping", symbol)
+            return symbol, None
+            
+        logger.debug("Running agents for %s", symbol)
+        
+        symbol_data = batch_data[symbol]
+        stock_data = symbol_data['stock_data']
+        enhanced_metrics = symbol_data['enhanced_metrics']
+        fundamentals = symbol_data.get('fundamentals')
+        data_source = symbol_data['data_source']
+        
+        # Shared indicators computed once and read by every agent
+        if stock_data and 'current_price' in enhanced_metrics:
+            df = stock_data['price_data']
+            col_map = _resolve_columns(df)
+            enhanced_metrics = {
+                **enhanced_metrics,
+                **_precompute_indicators(df, col_map, enhanced_metrics['current_price'])
+            }
+        
+        # All agents analyze the same cached data
+        value_analysis = self.value_agent.analyze(symbol, stock_data, fundamentals, enhanced_metrics)
+        technical_analysis = self.technical_agent.analyze(symbol, stock_data, enhanced_metrics)
+        risk_analysis = self.risk_manager.analyze(symbol, stock_data, enhanced_metrics)
+        outputs.record(idx, value_analysis, technical_analysis, risk_analysis, enhanced_metrics.get('current_price'))
+        
+        return symbol, (value_analysis, technical_analysis, risk_analysis, enhanced_metrics, data_source)
+    
     def analyze_symbols(self, symbols: List[str]) -> Dict[str, OptimizedTradingRecommendation]:
         """Analyze multiple symbols efficiently"""
         print(f"\n🎯 EFFICIENT MULTI-SYMBOL ANALYSIS")
@@ -368,31 +673,22 @@ class OptimizedMultiAgentTradingSystem:
         # Step 2: Run all agents on cached data (no additional API calls)
         recommendations = {}
         
-        for symbol in symbols:
-            if symbol not in batch_data:
-                print(f"⚠️ No data available for {symbol}, skipping...")
-                continue
-                
-            print(f"\n🤖 Running agents for {symbol}...")
-            
-            symbol_data = batch_data[symbol]
-            stock_data = symbol_data['stock_data']
-            enhanced_metrics = symbol_data['enhanced_metrics']
-            fundamentals = symbol_data.get('fundamentals')
-            data_source = symbol_data['data_source']
-            
-            # All agents analyze the same cached data
-            value_analysis = self.value_agent.analyze(symbol, stock_data, fundamentals, enhanced_metrics)
-            technical_analysis = self.technical_agent.analyze(symbol, stock_data, enhanced_metrics)
-            risk_analysis = self.risk_manager.analyze(symbol, stock_data, enhanced_metrics)
+        if symbols:
+            n_symbols = len(symbols)
+            outputs = AgentOutputArrays.allocate(n_symbols)
+            with ThreadPoolExecutor(max_workers=min(8, n_symbols)) as ex:
+                results = list(ex.map(self._analyze_one, symbols, [batch_data] * n_symbols,
+                                      range(n_symbols), [outputs] * n_symbols))
             
-            # Create final recommendation
-            recommendation = self._create_consensus_recommendation(
-                symbol, value_analysis, technical_analysis, risk_analysis, 
-                enhanced_metrics, data_source
-            )
-            
-            recommendations[symbol] = recommendation
+            analyzed = [(symbol, analyses) for symbol, analyses in results if analyses is not None]
+            if analyzed:
+                consensus = self._create_consensus_recommendations(
+                    [symbol for symbol, _ in analyzed], [analyses for _, analyses in analyzed], outputs
+                )
+                recommendations = {rec.symbol: rec for rec in consensus}
+        
+        # Column-wise copy for ranking/filtering across the whole batch
+        self.recommendation_table = RecommendationTable.from_recommendations(list(recommendations.values()))
         
         # Usage statistics
         stats = self.data_manager.get_usage_stats()
@@ -403,65 +699,60 @@ class OptimizedMultiAgentTradingSystem:
         
         return recommendations
     
-    def _create_consensus_recommendation(self, symbol: str, value_analysis: Dict, 
-                                       technical_analysis: Dict, risk_analysis: Dict,
-                                       enhanced_metrics: Dict, data_source: str) -> OptimizedTradingRecommendation:
-        """Create consensus recommendation from all agents"""
-        
-        # Collect agent votes
-        agent_votes = {
-            'Value Agent': value_analysis['recommendation'],
-            'Technical Agent': technical_analysis['recommendation'],
-            'Risk Manager': risk_analysis['recommendation']
-        }
+    def _create_consensus_recommendations(self, symbols: List[str], analyses: List[tuple],
+                                         outputs: AgentOutputArrays) -> List[OptimizedTradingRecommendation]:
+        """Create consensus recommendations for all symbols at once from the agents' output arrays"""
+        value_analyses, technical_analyses, risk_analyses, metrics, sources = zip(*analyses)
+        
+        # Vote and score columns across analyzed symbols
+        filled = outputs.filled
+        votes = outputs.votes[filled]
+        risk_score = outputs.risk_score[filled]
+        vote_confidence = outputs.vote_confidence[filled].mean(axis=1)
+        buy_votes = (votes == 'BUY').sum(axis=1)
+        sell_votes = (votes == 'SELL').sum(axis=1)
         
         # Weighted consensus (Risk Manager has veto power)
-        if risk_analysis['risk_score'] > 70:
-            final_recommendation = 'SELL'
-            confidence = risk_analysis['confidence']
-            reasoning = f"High risk override: {risk_analysis['reasoning']}"
-        else:
-            buy_votes = sum(1 for vote in agent_votes.values() if vote == 'BUY')
-            sell_votes = sum(1 for vote in agent_votes.values() if vote == 'SELL')
+        risk_veto = risk_score > 70
+        final_action = np.where(risk_veto, 'SELL',
+                                np.where(buy_votes >= 2, 'BUY',
+                                         np.where(sell_votes >= 2, 'SELL', 'HOLD')))
+        
+        # Target price for buys: more upside when risk is low
+        current_price = outputs.current_price[filled]
+        target_price = np.where(final_action == 'BUY',
+                                current_price * np.where(risk_score > 30, 1.10, 1.15), np.nan)
+        
+        recommendations = []
+        for i, symbol in enumerate(symbols):
+            value_analysis = value_analyses[i]
+            technical_analysis = technical_analyses[i]
+            risk_analysis = risk_analyses[i]
+            action = str(final_action[i])
             
-            if buy_votes >= 2:
-                final_recommendation = 'BUY'
-                confidence = (value_analysis['confidence'] + technical_analysis['confidence']) / 2
-            elif sell_votes >= 2:
-                final_recommendation = 'SELL'
-                confidence = (value_analysis['confidence'] + technical_analysis['confidence']) / 2
+            if risk_veto[i]:
+                confidence = risk_analysis['confidence']
             else:
-                final_recommendation = 'HOLD'
-                confidence = 50
+                confidence = float(vote_confidence[i]) if action != 'HOLD' else 50
             
-            reasoning_parts = [
-                f"Value: {value_analysis['reasoning']}",
-                f"Technical: {technical_analysis['reasoning']}",
-                f"Risk: {risk_analysis['reasoning']}"
-            ]
-            reasoning = " | ".join(reasoning_parts)
-        
-        # Calculate target price
-        target_price = None
-        if final_recommendation == 'BUY':
-            current_price = enhanced_metrics['current_price']
-            upside_potential = 0.10 if risk_analysis['risk_score'] > 30 else 0.15
-            target_price = current_price * (1 + upside_potential)
+            target = target_price[i]
+            recommendations.append(OptimizedTradingRecommendation(
+                symbol=symbol,
+                action=action,
+                confidence=round(confidence, 1),
+                target_price=None if np.isnan(target) or target == 0 else round(float(target), 2),
+                reasoning_codes=(value_analysis['reasoning_codes'], technical_analysis['reasoning_codes'],
+                                 risk_analysis['reasoning_codes']),
+                agent_votes=dict(zip(('Value Agent', 'Technical Agent', 'Risk Manager'), votes[i].tolist())),
+                data_quality=metrics[i].get('data_quality', 'Unknown'),
+                data_source=sources[i],
+                risk_score=risk_analysis['risk_score'],
+                fundamental_score=value_analysis.get('fundamental_score'),
+                technical_score=technical_analysis['score'],
+                market_timing_score=100 - risk_analysis['risk_score']
+            ))
         
-        return OptimizedTradingRecommendation(
-            symbol=symbol,
-            action=final_recommendation,
-            confidence=round(confidence, 1),
-            target_price=round(target_price, 2) if target_price else None,
-            reasoning=reasoning,
-            agent_votes=agent_votes,
-            data_quality=enhanced_metrics.get('data_quality', 'Unknown'),
-            data_source=data_source,
-            risk_score=risk_analysis['risk_score'],
-            fundamental_score=value_analysis.get('fundamental_score'),
-            technical_score=technical_analysis['score'],
-            market_timing_score=100 - risk_analysis['risk_score']
-        )
+        return recommendations
     
     def display_recommendations(self, recommendations: Dict[str, OptimizedTradingRecommendation]):
         """Display all recommendations in a clean format"""
@@ -482,6 +773,7 @@ class OptimizedMultiAgentTradingSystem:
 
 def main():
     """Test optimized system"""
+    logging.basicConfig(level=logging.INFO)
     system = OptimizedMultiAgentTradingSystem()
     
     # Test with current positions + a few more
@@ -10,10 +10,147 @@ from datetime import datetime, timedelta
 import json
 import os
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from functools import lru_cache
 
 from smart_data_manager import SmartDataManager
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> datetime:
+    """Parse a YYYY-MM-DD date (cached - trades share entry/expiry dates)"""
+    return datetime.strptime(date_str, '%Y-%m-%d')
+
+def _trade_days(trades: List[Dict], key: str) -> np.ndarray:
+    """Day-resolution dates for one trade field; malformed dates become NaT (reported per trade)"""
+    days = np.full(len(trades), np.datetime64('NaT'), dtype='datetime64[D]')
+    for i, trade in enumerate(trades):
+        try:
+            days[i] = np.datetime64(_parse_date(trade[key]).date(), 'D')
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"   ❌ Backtest error for {trade.get('symbol')}: {e}")
+    return days
+
+def _index_i8(stock_data: Dict) -> np.ndarray:
+    """Price index as int64 UTC nanoseconds, cached on the stock_data dict for reuse across trades"""
+    if '_index_i8' not in stock_data:
+        index = stock_data['price_data'].index
+        stock_data['_index_i8'] = index.values.astype('datetime64[ns]').view('i8')
+    return stock_data['_index_i8']
+
+def _close_array(stock_data: Dict) -> np.ndarray:
+    """Closing prices as a float64 array, cached on the stock_data dict for reuse across trades"""
+    if '_close' not in stock_data:
+        df = stock_data['price_data']
+        close_col = 'Close' if 'Close' in df.columns else 'close'
+        stock_data['_close'] = df[close_col].to_numpy(dtype=np.float64)
+    return stock_data['_close']
+
+def _dates_to_i8(dates, tz) -> np.ndarray:
+    """YYYY-MM-DD dates as int64 nanoseconds, read as wall-clock dates in the index timezone"""
+    targets = pd.DatetimeIndex(dates)
+    if tz is not None:
+        targets = targets.tz_localize(tz)
+    return targets.values.astype('datetime64[ns]').view('i8')
+
+def _nearest_positions(index_i8: np.ndarray, targets_i8: np.ndarray) -> np.ndarray:
+    """Positions of the nearest index entries (ties go to the later date, like get_indexer 'nearest')"""
+    n = len(index_i8)
+    right = np.searchsorted(index_i8, targets_i8, side='left')
+    left = np.searchsorted(index_i8, targets_i8, side='right') - 1
+    right_valid = right < n
+    left_dist = targets_i8 - index_i8[np.maximum(left, 0)]
+    right_dist = index_i8[np.minimum(right, n - 1)] - targets_i8
+    use_left = (left >= 0) & (~right_valid | (left_dist < right_dist))
+    return np.where(use_left, left, right)
+
+def _price_batch_loop(s_entry, s_exit, strikes, is_call, entry_prices, entry_dte, exit_dte):
+    """Scalar-loop form of `_price_batch_numpy`, compiled with numba when it is installed"""
+    n = s_entry.shape[0]
+    exit_price = np.empty(n)
+    pnl = np.empty(n)
+    pnl_percent = np.empty(n)
+    underlying_move = np.empty(n)
+    time_decay_cost = np.empty(n)
+    
+    for i in range(n):
+        if is_call[i]:
+            entry_intrinsic = s_entry[i] - strikes[i]
+            exit_intrinsic = s_exit[i] - strikes[i]
+        else:
+            entry_intrinsic = strikes[i] - s_entry[i]
+            exit_intrinsic = strikes[i] - s_exit[i]
+        entry_intrinsic = entry_intrinsic if entry_intrinsic > 0.0 else 0.0
+        exit_intrinsic = exit_intrinsic if exit_intrinsic > 0.0 else 0.0
+        
+        entry_time_value = entry_prices[i] - entry_intrinsic
+        exit_time_value = entry_time_value * (exit_dte[i] / entry_dte[i]) if entry_dte[i] > 0 else 0.0
+        
+        exit_price[i] = exit_intrinsic + exit_time_value
+        pnl[i] = exit_price[i] - entry_prices[i]
+        pnl_percent[i] = (pnl[i] / entry_prices[i]) * 100 if entry_prices[i] > 0 else 0.0
+        underlying_move[i] = (s_exit[i] - s_entry[i]) / s_entry[i] * 100
+        time_decay_cost[i] = entry_time_value - exit_time_value
+    
+    return exit_price, pnl, pnl_percent, underlying_move, time_decay_cost
+
+def _price_batch_numpy(s_entry: np.ndarray, s_exit: np.ndarray, strikes: np.ndarray, is_call: np.ndarray,
+                 entry_prices: np.ndarray, entry_dte: np.ndarray, exit_dte: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Simplified option repricing for a batch of trades (same model as the single-trade simulation)
+    
+    Returns (exit_price, pnl, pnl_percent, underlying_move, time_decay_cost) arrays.
+    """
+    # Intrinsic values (fmax treats a missing close like max(0, nan) does: as 0)
+    entry_intrinsic = np.where(is_call, np.fmax(0.0, s_entry - strikes), np.fmax(0.0, strikes - s_entry))
+    exit_intrinsic = np.where(is_call, np.fmax(0.0, s_exit - strikes), np.fmax(0.0, strikes - s_exit))
+    
+    # Time value decays linearly with days to expiry
+    entry_time_value = entry_prices - entry_intrinsic
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exit_time_value = np.where(entry_dte > 0, entry_time_value * (exit_dte / entry_dte), 0.0)
+        exit_price = exit_intrinsic + exit_time_value
+        pnl = exit_price - entry_prices
+        pnl_percent = np.where(entry_prices > 0, (pnl / entry_prices) * 100, 0.0)
+        underlying_move = (s_exit - s_entry) / s_entry * 100
+    time_decay_cost = entry_time_value - exit_time_value
+    
+    return exit_price, pnl, pnl_percent, underlying_move, time_decay_cost
+
+# error_model='numpy' keeps IEEE results (inf/nan) for a zero entry close instead of raising
+_price_batch = njit(cache=True, error_model='numpy')(_price_batch_loop) if njit else _price_batch_numpy
+
+def _max_drawdown_loop(pnl):
+    """Largest peak-to-trough drop of cumulative pnl in one pass, without cumulative arrays"""
+    cumulative = 0.0
+    peak = -np.inf
+    max_drawdown = 0.0
+    for x in pnl:
+        cumulative += x
+        if cumulative > peak:
+            peak = cumulative
+        drawdown = peak - cumulative
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+    return max_drawdown
+
+def _max_drawdown_numpy(pnl: np.ndarray) -> float:
+    """Vectorized `_max_drawdown_loop` for environments without numba"""
+    if pnl.size == 0:
+        return 0.0
+    cumulative_pnl = np.cumsum(pnl)
+    return abs((cumulative_pnl - np.maximum.accumulate(cumulative_pnl)).min())
+
+_max_drawdown = njit(cache=True)(_max_drawdown_loop) if njit else _max_drawdown_numpy
+
 @dataclass
 class BacktestResult:
     symbol: str
@@ -33,6 +170,13 @@ class BacktestResult:
     iv_change: float
     time_decay_cost: float
 
+_RESULT_FIELDS = tuple(field.name for field in fields(BacktestResult))
+
+# Option type codes for masks (anything else is priced as a put but counted as neither)
+_OPT_CALL = 0
+_OPT_PUT = 1
+_OPTION_CODES = {'CALL': _OPT_CALL, 'PUT': _OPT_PUT}
+
 @dataclass 
 class StrategyPerformance:
     total_trades: int
@@ -50,52 +194,88 @@ class StrategyPerformance:
     avg_days_held: float
 
 class OptionsBacktester:
-    def __init__(self):
-        """Initialize backtesting framework"""
+    def __init__(self, verbose: bool = True):
+        """Initialize backtesting framework (verbose=False skips per-trade output on large batches)"""
         self.data_manager = SmartDataManager()
-        self.results = []
+        self.verbose = verbose
+        self._cols: Dict[str, List] = {name: [] for name in _RESULT_FIELDS}  # Column per BacktestResult field
+        self._cols['option_code'] = []  # _OPT_CALL / _OPT_PUT / -1 per result
+        self._price_cache: Dict[str, Tuple[str, str, Dict]] = {}  # symbol -> (start, end, stock_data)
         
         print("📊 OPTIONS BACKTESTING FRAMEWORK INITIALIZED")
         print("   🔬 Historical strategy validation")
         print("   📈 Performance metrics calculation")
         print("   🧠 Machine learning data generation")
     
+    @property
+    def results(self) -> List[BacktestResult]:
+        """All backtested trades as BacktestResult records (rebuilt from the result columns)"""
+        return self._rows_to_results(self._cols)
+    
+    @staticmethod
+    def _rows_to_results(columns: Dict[str, List]) -> List[BacktestResult]:
+        """Materialize BacktestResult records from per-field columns"""
+        return [BacktestResult(*row) for row in zip(*(columns[name] for name in _RESULT_FIELDS))]
+    
+    def _get_price_history(self, symbol: str, start_date: str, end_date: str) -> Optional[Dict]:
+        """Stock data covering start_date..end_date, reusing an earlier fetch for the symbol if it spans the window"""
+        cached = self._price_cache.get(symbol)
+        if cached and cached[0] <= start_date and end_date <= cached[1]:
+            return cached[2]
+        
+        stock_data = self.data_manager.get_stock_data(symbol, start_date, end_date)
+        if stock_data:
+            self._price_cache[symbol] = (start_date, end_date, stock_data)
+        return stock_data
+    
     def simulate_historical_option_performance(self, symbol: str, strike: float, 
                                              entry_date: str, expiry_date: str, 
                                              option_type: str, entry_price: float,
                                              hold_days: int = None) -> Optional[BacktestResult]:
         """Simulate how an option would have performed historically"""
+        values = self._simulate_scalars(symbol, strike, entry_date, expiry_date, option_type, entry_price, hold_days)
+        return BacktestResult(*values) if values else None
+    
+    def _simulate_scalars(self, symbol: str, strike: float, entry_date: str, expiry_date: str,
+                          option_type: str, entry_price: float, hold_days: int = None) -> Optional[Tuple]:
+        """Single-trade simulation as a tuple of BacktestResult field values (in field order)"""
         
         try:
+            # Parse dates once; everything below works on datetimes
+            entry_dt = _parse_date(entry_date)
+            expiry_dt = _parse_date(expiry_date)
+            
             # Get historical stock data
-            start_date = (datetime.strptime(entry_date, '%Y-%m-%d') - timedelta(days=30)).strftime('%Y-%m-%d')
-            end_date = (datetime.strptime(expiry_date, '%Y-%m-%d') + timedelta(days=5)).strftime('%Y-%m-%d')
+            start_date = (entry_dt - timedelta(days=30)).strftime('%Y-%m-%d')
+            end_date = (expiry_dt + timedelta(days=5)).strftime('%Y-%m-%d')
             
-            stock_data = self.data_manager.get_stock_data(symbol, start_date, end_date)
+            stock_data = self._get_price_history(symbol, start_date, end_date)
             if not stock_data:
                 return None
             
             df = stock_data['price_data']
-            close_col = 'Close' if 'Close' in df.columns else 'close'
+            close = _close_array(stock_data)
+            index_i8 = _index_i8(stock_data)
             
             # Get entry price
-            entry_idx = df.index.get_indexer([entry_date], method='nearest')[0]
-            entry_stock_price = df.iloc[entry_idx][close_col]
+            entry_idx = _nearest_positions(index_i8, _dates_to_i8([entry_date], df.index.tz))[0]
+            entry_stock_price = close[entry_idx]
             
             # Determine exit date
             if hold_days:
-                exit_date = (datetime.strptime(entry_date, '%Y-%m-%d') + timedelta(days=hold_days)).strftime('%Y-%m-%d')
-                exit_date = min(exit_date, expiry_date)  # Can't hold past expiry
+                exit_dt = min(entry_dt + timedelta(days=hold_days), expiry_dt)  # Can't hold past expiry
+                exit_date = exit_dt.strftime('%Y-%m-%d')
             else:
+                exit_dt = expiry_dt
                 exit_date = expiry_date
             
             # Get exit price
-            exit_idx = df.index.get_indexer([exit_date], method='nearest')[0]
-            exit_stock_price = df.iloc[exit_idx][close_col]
+            exit_idx = _nearest_positions(index_i8, _dates_to_i8([exit_date], df.index.tz))[0]
+            exit_stock_price = close[exit_idx]
             
             # Calculate option values (simplified Black-Scholes approximation)
-            entry_days_to_expiry = (datetime.strptime(expiry_date, '%Y-%m-%d') - datetime.strptime(entry_date, '%Y-%m-%d')).days
-            exit_days_to_expiry = (datetime.strptime(expiry_date, '%Y-%m-%d') - datetime.strptime(exit_date, '%Y-%m-%d')).days
+            entry_days_to_expiry = (expiry_dt - entry_dt).days
+            exit_days_to_expiry = (expiry_dt - exit_dt).days
             
             # Intrinsic values
             if option_type == 'CALL':
@@ -115,7 +295,7 @@ class OptionsBacktester:
             # Calculate performance metrics
             pnl = exit_price - entry_price
             pnl_percent = (pnl / entry_price) * 100 if entry_price > 0 else 0
-            days_held = (datetime.strptime(exit_date, '%Y-%m-%d') - datetime.strptime(entry_date, '%Y-%m-%d')).days
+            days_held = (exit_dt - entry_dt).days
             
             # Track max profit/loss during holding period
             max_profit = pnl
@@ -124,94 +304,156 @@ class OptionsBacktester:
             underlying_move = (exit_stock_price - entry_stock_price) / entry_stock_price * 100
             time_decay_cost = entry_time_value - exit_time_value
             
-            return BacktestResult(
-                symbol=symbol,
-                entry_date=entry_date,
-                exit_date=exit_date,
-                strike=strike,
-                option_type=option_type,
-                entry_price=entry_price,
-                exit_price=exit_price,
-                pnl=pnl,
-                pnl_percent=pnl_percent,
-                days_held=days_held,
-                max_profit=max_profit,
-                max_loss=max_loss,
-                win=pnl > 0,
-                underlying_move=underlying_move,
-                iv_change=0,  # Simplified - would need historical IV data
-                time_decay_cost=time_decay_cost
-            )
+            return (symbol, entry_date, exit_date, strike, option_type, entry_price, exit_price,
+                    pnl, pnl_percent, days_held, max_profit, max_loss, pnl > 0, underlying_move,
+                    0,  # iv_change: simplified - would need historical IV data
+                    time_decay_cost)
             
         except Exception as e:
             print(f"   ❌ Backtest error for {symbol}: {e}")
             return None
     
+    def _fetch_underlying_prices(self, symbols: np.ndarray, entry_days: np.ndarray, exit_days: np.ndarray,
+                                 expiry_days: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Nearest closes at entry and exit for every trade, fetching each symbol's history once
+        
+        Returns (entry_close, exit_close, fetched) where `fetched` marks trades with price data.
+        Trades with unparseable (NaT) dates are never fetched.
+        """
+        valid = ~(np.isnat(entry_days) | np.isnat(expiry_days))
+        n = len(symbols)
+        s_entry = np.full(n, np.nan)
+        s_exit = np.full(n, np.nan)
+        fetched = np.zeros(n, dtype=bool)
+        
+        # Sequential on purpose: SmartDataManager's request counters, rate-limit
+        # checks and cache aren't thread-safe
+        for symbol in dict.fromkeys(symbols[valid].tolist()):
+            rows = np.flatnonzero((symbols == symbol) & valid)
+            try:
+                # One window covering every trade on this symbol
+                start_date = str(entry_days[rows].min() - np.timedelta64(30, 'D'))
+                end_date = str(expiry_days[rows].max() + np.timedelta64(5, 'D'))
+                stock_data = self._get_price_history(symbol, start_date, end_date)
+                if not stock_data:
+                    continue
+                
+                df = stock_data['price_data']
+                close = _close_array(stock_data)
+                index_i8 = _index_i8(stock_data)
+                entry_idx = _nearest_positions(index_i8, _dates_to_i8(entry_days[rows], df.index.tz))
+                exit_idx = _nearest_positions(index_i8, _dates_to_i8(exit_days[rows], df.index.tz))
+                s_entry[rows] = close[entry_idx]
+                s_exit[rows] = close[exit_idx]
+                fetched[rows] = True
+            except Exception as e:
+                print(f"   ❌ Backtest error for {symbol}: {e}")
+        
+        return s_entry, s_exit, fetched
+    
     def backtest_strategy(self, strategy_name: str, trades: List[Dict]) -> StrategyPerformance:
-        """Backtest a complete strategy with multiple trades"""
+        """Backtest a complete strategy with multiple trades (priced as one batch)"""
         
         print(f"\n📊 BACKTESTING STRATEGY: {strategy_name}")
         print("=" * 50)
         
-        results = []
+        # Stack trade parameters into arrays sized once for the whole batch
+        n = len(trades)
+        symbols = np.array([trade['symbol'] for trade in trades])
+        strikes = np.fromiter((trade['strike'] for trade in trades), dtype=np.float64, count=n)
+        entry_prices = np.fromiter((trade['entry_price'] for trade in trades), dtype=np.float64, count=n)
+        option_codes = np.fromiter((_OPTION_CODES.get(trade['option_type'], -1) for trade in trades),
+                                   dtype=np.int8, count=n)
+        is_call = option_codes == _OPT_CALL
+        entry_days = _trade_days(trades, 'entry_date')
+        expiry_days = _trade_days(trades, 'expiry_date')
+        hold_days = np.fromiter((trade.get('hold_days') or 0 for trade in trades), dtype=np.int64, count=n)
         
-        for i, trade in enumerate(trades, 1):
-            print(f"[{i}/{len(trades)}] Testing {trade['symbol']} {trade['option_type']} ${trade['strike']}")
-            
-            result = self.simulate_historical_option_performance(
-                symbol=trade['symbol'],
-                strike=trade['strike'],
-                entry_date=trade['entry_date'],
-                expiry_date=trade['expiry_date'],
-                option_type=trade['option_type'],
-                entry_price=trade['entry_price'],
-                hold_days=trade.get('hold_days')
-            )
-            
-            if result:
-                results.append(result)
-                self.results.append(result)
-                print(f"   📊 P&L: ${result.pnl:.2f} ({result.pnl_percent:+.1f}%) in {result.days_held} days")
+        # Exit after hold_days, but never past expiry
+        exit_days = np.where(hold_days != 0, np.minimum(entry_days + hold_days, expiry_days), expiry_days)
+        entry_dte = (expiry_days - entry_days).astype(np.int64)
+        exit_dte = (expiry_days - exit_days).astype(np.int64)
+        days_held = (exit_days - entry_days).astype(np.int64)
+        
+        s_entry, s_exit, fetched = self._fetch_underlying_prices(symbols, entry_days, exit_days, expiry_days)
+        exit_price, pnl, pnl_percent, underlying_move, time_decay_cost = _price_batch(
+            s_entry, s_exit, strikes, is_call, entry_prices, entry_dte, exit_dte
+        )
         
-        # Calculate strategy performance
-        if not results:
+        # Result columns for trades that had price data
+        rows = np.flatnonzero(fetched)
+        batch = {
+            'symbol': [trades[i]['symbol'] for i in rows],
+            'entry_date': [trades[i]['entry_date'] for i in rows],
+            'exit_date': exit_days[rows].astype(str).tolist(),
+            'strike': [trades[i]['strike'] for i in rows],
+            'option_type': [trades[i]['option_type'] for i in rows],
+            'entry_price': [trades[i]['entry_price'] for i in rows],
+            'exit_price': exit_price[rows].tolist(),
+            'pnl': pnl[rows].tolist(),
+            'pnl_percent': pnl_percent[rows].tolist(),
+            'days_held': days_held[rows].tolist(),
+            'max_profit': pnl[rows].tolist(),
+            'max_loss': pnl[rows].tolist(),
+            'win': (pnl[rows] > 0).tolist(),
+            'underlying_move': underlying_move[rows].tolist(),
+            'iv_change': [0] * len(rows),  # Simplified - would need historical IV data
+            'time_decay_cost': time_decay_cost[rows].tolist()
+        }
+        for name in _RESULT_FIELDS:
+            self._cols[name].extend(batch[name])
+        self._cols['option_code'].extend(option_codes[rows].tolist())
+        
+        if self.verbose:
+            for i, trade in enumerate(trades):
+                print(f"[{i + 1}/{n}] Testing {trade['symbol']} {trade['option_type']} ${trade['strike']}")
+                if fetched[i]:
+                    print(f"   📊 P&L: ${pnl[i]:.2f} ({pnl_percent[i]:+.1f}%) in {days_held[i]} days")
+        print(f"   ✅ Priced {len(rows)}/{n} trades")
+        
+        # Calculate strategy performance (no per-trade records needed)
+        if not len(rows):
             print("   ❌ No valid backtest results")
             return None
         
-        return self._calculate_performance_metrics(results)
+        return self._calculate_performance_metrics(pnl[rows], days_held[rows])
     
-    def _calculate_performance_metrics(self, results: List[BacktestResult]) -> StrategyPerformance:
-        """Calculate comprehensive performance metrics"""
+    def _calculate_performance_metrics(self, pnl: np.ndarray, days_held: np.ndarray) -> StrategyPerformance:
+        """Calculate comprehensive performance metrics from per-trade pnl and days-held arrays"""
         
-        total_trades = len(results)
-        winning_trades = sum(1 for r in results if r.win)
+        total_trades = len(pnl)
+        
+        win_mask = pnl > 0
+        wins = pnl[win_mask]
+        losses = pnl[~win_mask]
+        
+        winning_trades = int(win_mask.sum())
         losing_trades = total_trades - winning_trades
         
         win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
         
-        wins = [r.pnl for r in results if r.win]
-        losses = [r.pnl for r in results if not r.win]
+        # Each sum/std reduced once and reused
+        win_total = wins.sum()
+        loss_total = losses.sum()
         
-        avg_win = np.mean(wins) if wins else 0
-        avg_loss = abs(np.mean(losses)) if losses else 0
+        avg_win = win_total / wins.size if wins.size else 0
+        avg_loss = abs(loss_total / losses.size) if losses.size else 0
         
-        profit_factor = (sum(wins) / abs(sum(losses))) if losses else float('inf')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_factor = (win_total / abs(loss_total)) if losses.size else float('inf')
         
-        # Calculate cumulative returns for drawdown
-        cumulative_pnl = np.cumsum([r.pnl for r in results])
-        running_max = np.maximum.accumulate(cumulative_pnl)
-        drawdown = (cumulative_pnl - running_max)
-        max_drawdown = abs(min(drawdown)) if len(drawdown) > 0 else 0
+        # Peak-to-trough drop of cumulative pnl
+        max_drawdown = _max_drawdown(pnl)
         
-        total_return = sum(r.pnl for r in results)
+        total_return = pnl.sum()
         
         # Simplified Sharpe ratio
-        returns = [r.pnl for r in results]
-        sharpe_ratio = (np.mean(returns) / np.std(returns)) if np.std(returns) > 0 else 0
+        pnl_std = pnl.std()
+        sharpe_ratio = (total_return / total_trades / pnl_std) if pnl_std > 0 else 0
         
-        best_trade = max(r.pnl for r in results)
-        worst_trade = min(r.pnl for r in results)
-        avg_days_held = np.mean([r.days_held for r in results])
+        best_trade = pnl.max()
+        worst_trade = pnl.min()
+        avg_days_held = days_held.mean()
         
         performance = StrategyPerformance(
             total_trades=total_trades,
@@ -263,39 +505,40 @@ class OptionsBacktester:
     def analyze_what_works(self) -> Dict:
         """Analyze patterns in successful vs failed trades"""
         
-        if not self.results:
+        if not self._cols['pnl']:
             print("No backtest results to analyze")
             return {}
         
         print(f"\n🧠 ANALYZING SUCCESS PATTERNS")
         print("=" * 40)
         
-        wins = [r for r in self.results if r.win]
-        losses = [r for r in self.results if not r.win]
+        df = pd.DataFrame({
+            'win': self._cols['win'],
+            'option_code': self._cols['option_code'],
+            'days_held': self._cols['days_held'],
+            'underlying_move': self._cols['underlying_move']
+        })
+        by_outcome = df.groupby('win')[['days_held', 'underlying_move']].mean()
         
         analysis = {}
         
-        if wins and losses:
+        if True in by_outcome.index and False in by_outcome.index:
             # Days held analysis
-            avg_win_days = np.mean([w.days_held for w in wins])
-            avg_loss_days = np.mean([l.days_held for l in losses])
+            avg_win_days = by_outcome.loc[True, 'days_held']
+            avg_loss_days = by_outcome.loc[False, 'days_held']
             
             print(f"📊 Avg Days Held: Wins {avg_win_days:.1f} vs Losses {avg_loss_days:.1f}")
             
             # Underlying move analysis
-            avg_win_move = np.mean([w.underlying_move for w in wins])
-            avg_loss_move = np.mean([l.underlying_move for l in losses])
+            avg_win_move = by_outcome.loc[True, 'underlying_move']
+            avg_loss_move = by_outcome.loc[False, 'underlying_move']
             
             print(f"📈 Avg Underlying Move: Wins {avg_win_move:+.1f}% vs Losses {avg_loss_move:+.1f}%")
             
             # Option type analysis
-            call_wins = sum(1 for w in wins if w.option_type == 'CALL')
-            call_total = sum(1 for r in self.results if r.option_type == 'CALL')
-            put_wins = sum(1 for w in wins if w.option_type == 'PUT')
-            put_total = sum(1 for r in self.results if r.option_type == 'PUT')
-            
-            call_win_rate = (call_wins / call_total * 100) if call_total > 0 else 0
-            put_win_rate = (put_wins / put_total * 100) if put_total > 0 else 0
+            win_rates = df.groupby('option_code')['win'].mean() * 100
+            call_win_rate = win_rates.get(_OPT_CALL, 0)
+            put_win_rate = win_rates.get(_OPT_PUT, 0)
             
             print(f"🎯 Win Rates: Calls {call_win_rate:.1f}% vs Puts {put_win_rate:.1f}%")
             
@@ -310,21 +553,44 @@ class OptionsBacktester:
         
         return analysis
     
-    def save_backtest_results(self, filename: str = None):
-        """Save backtest results for further analysis"""
+    def save_backtest_results(self, filename: str = None, file_format: str = 'json'):
+        """Save backtest results for further analysis
+        
+        file_format: 'json' (human-readable), 'parquet' (typed columns, compact and fast to reload) or 'both'.
+        """
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"backtest_results_{timestamp}"
         
         os.makedirs("data/backtesting", exist_ok=True)
         
+        write_json = file_format in ('json', 'both')
+        if file_format in ('parquet', 'both'):
+            parquet_file = f"data/backtesting/{filename}.parquet"
+            try:
+                pd.DataFrame(self._cols, columns=list(_RESULT_FIELDS)).to_parquet(parquet_file, compression='zstd')
+                print(f"\n💾 Backtest results saved: {parquet_file}")
+            except ImportError:
+                print("   ⚠️ Parquet needs pyarrow (or fastparquet), saving JSON instead")
+                write_json = True
+        
+        if not write_json:
+            return
+        
+        # Records straight from the result columns (no dataclass round-trip)
+        payload = {
+            'backtest_timestamp': datetime.now().isoformat(),
+            'total_trades': len(self._cols['pnl']),
+            'results': [dict(zip(_RESULT_FIELDS, row)) for row in zip(*(self._cols[name] for name in _RESULT_FIELDS))]
+        }
+        
         json_file = f"data/backtesting/{filename}.json"
-        with open(json_file, 'w') as f:
-            json.dump({
-                'backtest_timestamp': datetime.now().isoformat(),
-                'total_trades': len(self.results),
-                'results': [asdict(result) for result in self.results]
-            }, f, indent=2, default=str)
+        if orjson is not None:
+            with open(json_file, 'wb') as f:
+                f.write(orjson.dumps(payload, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(json_file, 'w') as f:
+                json.dump(payload, f, indent=2, default=str)
         
         print(f"\n💾 Backtest results saved: {json_file}")
 
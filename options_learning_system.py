@@ -6,12 +6,216 @@ Learn from wins/losses to refine scoring weights and selection criteria
 
 import pandas as pd
 import numpy as np
+import atexit
+import heapq
 import json
+import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from collections import defaultdict
+from scipy.stats import ttest_ind_from_stats
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LEARNING_DIR = "data/learning"
+LEARNING_JSON_FILE = f"{LEARNING_DIR}/options_learning_data.json"
+LEARNING_PARQUET_FILE = f"{LEARNING_DIR}/options_learning_data.parquet"
+LEARNING_JOURNAL_FILE = f"{LEARNING_DIR}/options_learning_data.jsonl"  # Trades since the last full save
+
+def _dumps(obj) -> bytes:
+    """Compact JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=str).encode()
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+# One writer thread for every instance: queued (owner, kind, payload) items are applied
+# in order, and each owner is only referenced until its write is done
+_write_q = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+def _start_writer():
+    """Start the shared writer thread (and its exit-time flush) on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name='learning-data-writer', daemon=True)
+            _writer.start()
+            atexit.register(_write_q.join)
+
+def _writer_loop():
+    while True:
+        _apply_queued_writes()
+
+def _apply_queued_writes():
+    """Apply one burst of queued writes; a successful full save makes the appends queued before it redundant"""
+    batch = [_write_q.get()]
+    try:
+        while True:
+            batch.append(_write_q.get_nowait())
+    except queue.Empty:
+        pass
+    
+    try:
+        compactions = [i for i, (_, kind, _) in enumerate(batch) if kind == 'compact']
+        start = 0
+        if compactions:
+            owner, _, trades = batch[compactions[-1]]
+            if owner._write_learning_data(trades):
+                owner._saved_count = len(trades)
+                start = compactions[-1] + 1
+            for i in compactions:
+                batch[i][0]._compaction_queued = False
+        
+        # Without a successful full save, every queued trade still goes to the journal
+        entries = [(owner, entry) for owner, kind, entry in batch[start:] if kind == 'append']
+        if entries:
+            entries[0][0]._append_to_journal([entry for _, entry in entries])
+    finally:
+        for _ in batch:
+            _write_q.task_done()
+
+_OPTION_TYPES = ('CALL', 'PUT')
+_OPTION_CODES = {name: code for code, name in enumerate(_OPTION_TYPES)}
+
+# Features to analyze
+_FEATURES = (
+    'liquidity_score', 'value_score', 'momentum_score', 'volatility_score',
+    'risk_score', 'technical_strength', 'moneyness', 'days_to_expiry',
+    'implied_volatility', 'spread_pct', 'volume', 'open_interest'
+)
+
+def _is_missing(value) -> bool:
+    """None or NaN, matching what pandas treats as missing"""
+    return value is None or value != value
+
+class _RunningMedian:
+    """Two-heap running median: O(log n) insert, O(1) read"""
+    __slots__ = ('low', 'high')
+    
+    def __init__(self):
+        self.low = []   # max-heap of the lower half (negated)
+        self.high = []  # min-heap of the upper half
+    
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> '_RunningMedian':
+        """Build from a batch in O(n log n): sorted halves already satisfy the heap invariant"""
+        ordered = np.sort(values)
+        half = (len(ordered) + 1) // 2
+        running = cls()
+        running.low = (-ordered[:half][::-1]).tolist()
+        running.high = ordered[half:].tolist()
+        return running
+    
+    def __len__(self) -> int:
+        return len(self.low) + len(self.high)
+    
+    def push(self, value: float):
+        if self.low and value > -self.low[0]:
+            heapq.heappush(self.high, value)
+        else:
+            heapq.heappush(self.low, -value)
+        
+        if len(self.low) > len(self.high) + 1:
+            heapq.heappush(self.high, -heapq.heappop(self.low))
+        elif len(self.high) > len(self.low):
+            heapq.heappush(self.low, -heapq.heappop(self.high))
+    
+    def median(self) -> float:
+        if len(self.low) > len(self.high):
+            return -self.low[0]
+        return (-self.low[0] + self.high[0]) / 2
+
+def _compile_split_stats(n_features: int):
+    """Generate a median-split kernel with the feature loop unrolled (jitted when numba is available)
+    
+    f(X, wins, returns, medians) makes one pass over the trades, keeping every
+    feature's accumulators in locals. Only trades with a win, a return and a
+    value for the feature count. Returns an (8, n_features) array of rows: valid
+    count, high count, high/low win sums, high/low return sums and high/low
+    sums of squared returns.
+    """
+    stats = ('n', 'nh', 'wh', 'wl', 'rh', 'rl', 'qh', 'ql')
+    lines = ["def split_stats(X, wins, returns, medians):"]
+    lines += [f"    m{j} = medians[{j}]" for j in range(n_features)]
+    lines += [f"    {name}{j} = 0.0" for j in range(n_features) for name in stats]
+    lines += [
+        "    for i in range(X.shape[1]):",
+        "        w = wins[i]",
+        "        r = returns[i]",
+        "        if np.isnan(w) or np.isnan(r):",
+        "            continue",
+    ]
+    for j in range(n_features):
+        lines += [
+            f"        v = X[{j}, i]",
+            "        if not np.isnan(v):",
+            f"            n{j} += 1.0",
+            f"            if v >= m{j}:",
+            f"                nh{j} += 1.0",
+            f"                wh{j} += w",
+            f"                rh{j} += r",
+            f"                qh{j} += r * r",
+            "            else:",
+            f"                wl{j} += w",
+            f"                rl{j} += r",
+            f"                ql{j} += r * r",
+        ]
+    lines.append(f"    out = np.empty(({len(stats)}, {n_features}))")
+    lines += [f"    out[{k}, {j}] = {name}{j}" for j in range(n_features) for k, name in enumerate(stats)]
+    lines.append("    return out")
+    
+    namespace = {'np': np}
+    exec("\n".join(lines) + "\n", namespace)
+    split_stats = namespace['split_stats']
+    return njit(split_stats) if njit else split_stats
+
+def _split_stats_numpy(X, wins, returns, medians):
+    """Vectorized `_compile_split_stats` kernel for environments without numba"""
+    # One (features x trades) mask per side; the sums are mask @ column products
+    labelled = ~np.isnan(wins) & ~np.isnan(returns)
+    valid = labelled & ~np.isnan(X)
+    high = valid & (X >= medians[:, None])
+    low = valid & ~high
+    wins = np.where(labelled, wins, 0.0)
+    returns = np.where(labelled, returns, 0.0)
+    squares = returns * returns
+    return np.stack([
+        valid.sum(axis=1), high.sum(axis=1),
+        high @ wins, low @ wins,
+        high @ returns, low @ returns,
+        high @ squares, low @ squares
+    ]).astype(np.float64)
+
+_split_stats = _compile_split_stats(len(_FEATURES)) if njit else _split_stats_numpy
+
+def _welch_p_values(sum_a, sumsq_a, n_a, sum_b, sumsq_b, n_b) -> np.ndarray:
+    """Two-sided Welch's t-test p-values per column, from group sums and sums of squares"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_a, mean_b = sum_a / n_a, sum_b / n_b
+        std_a = np.sqrt(np.maximum(sumsq_a - n_a * mean_a ** 2, 0) / (n_a - 1))
+        std_b = np.sqrt(np.maximum(sumsq_b - n_b * mean_b ** 2, 0) / (n_b - 1))
+        _, p_values = ttest_ind_from_stats(mean_a, std_a, n_a, mean_b, std_b, n_b, equal_var=False)
+    # Undefined (too few samples or no variance in either group) counts as no evidence
+    return np.nan_to_num(p_values, nan=1.0)
 
 @dataclass
 class LearningMetrics:
@@ -23,9 +227,81 @@ class LearningMetrics:
     predictive_power: float  # How well this feature predicts success
     current_weight: float
     suggested_weight: float
-    confidence: float
+    confidence: float  # 1 - p-value of Welch's t-test on high vs low returns
+
+@dataclass
+class _TradeColumns:
+    """Growable column store for the fields the analysis reads (NaN where missing)
+    
+    Features are float32, one contiguous row per feature: they are bounded
+    scores, small ratios or counts, so half the bytes loses nothing that matters
+    for a median split. win/pnl_percent stay float64 to keep the means exact.
+    """
+    features: np.ndarray     # (len(_FEATURES), capacity) float32
+    win: np.ndarray          # 1.0 / 0.0
+    pnl_percent: np.ndarray
+    option_type: np.ndarray  # int8 index into _OPTION_TYPES, -1 when missing/other
+    size: int = 0
+    
+    @classmethod
+    def allocate(cls, capacity: int = 64) -> '_TradeColumns':
+        return cls(
+            features=np.full((len(_FEATURES), capacity), np.nan, dtype=np.float32),
+            win=np.full(capacity, np.nan),
+            pnl_percent=np.full(capacity, np.nan),
+            option_type=np.full(capacity, -1, dtype=np.int8)
+        )
+    
+    def _reserve(self, extra: int):
+        """Make room for `extra` more rows, at least doubling capacity (amortized O(1) append)"""
+        capacity = len(self.win)
+        if self.size + extra <= capacity:
+            return
+        grow = max(capacity, self.size + extra - capacity)
+        self.features = np.hstack([self.features, np.full((len(_FEATURES), grow), np.nan, dtype=np.float32)])
+        self.win = np.concatenate([self.win, np.full(grow, np.nan)])
+        self.pnl_percent = np.concatenate([self.pnl_percent, np.full(grow, np.nan)])
+        self.option_type = np.concatenate([self.option_type, np.full(grow, -1, dtype=np.int8)])
+    
+    def append(self, trade: Dict):
+        """Add one trade"""
+        self._reserve(1)
+        i = self.size
+        for j, feature in enumerate(_FEATURES):
+            value = trade.get(feature)
+            if not _is_missing(value):
+                self.features[j, i] = value
+        if not _is_missing(trade.get('win')):
+            self.win[i] = trade['win']
+        if not _is_missing(trade.get('pnl_percent')):
+            self.pnl_percent[i] = trade['pnl_percent']
+        self.option_type[i] = _OPTION_CODES.get(trade.get('option_type'), -1)
+        self.size += 1
+    
+    def extend(self, trades: List[Dict]):
+        """Add a batch of trades with one columnar conversion (used for loaded histories)"""
+        frame = pd.DataFrame(trades)
+        values = frame.reindex(columns=[*_FEATURES, 'win', 'pnl_percent']).to_numpy(
+            dtype=np.float64, na_value=np.nan)
+        n_features = len(_FEATURES)
+        self._reserve(len(trades))
+        rows = slice(self.size, self.size + len(trades))
+        self.features[:, rows] = values[:, :n_features].T
+        self.win[rows] = values[:, n_features]
+        self.pnl_percent[rows] = values[:, n_features + 1]
+        if 'option_type' in frame.columns:
+            self.option_type[rows] = frame['option_type'].map(_OPTION_CODES).fillna(-1).to_numpy(dtype=np.int8)
+        self.size += len(trades)
+    
+    def view(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(features, win, pnl_percent) for the filled rows"""
+        n = self.size
+        return self.features[:, :n], self.win[:n], self.pnl_percent[:n]
 
 class OptionsLearningSystem:
+    # Parsed learning files shared across instances: path -> (mtime_ns, size, trades)
+    _parsed_cache: Dict[str, Tuple[int, int, List[Dict]]] = {}
+    
     def __init__(self):
         """Initialize learning system"""
         
@@ -44,10 +320,27 @@ class OptionsLearningSystem:
         # Learning parameters
         self.min_samples = 10  # Minimum trades needed to adjust weights
         self.learning_rate = 0.1  # How quickly to adjust weights
-        self.confidence_threshold = 0.7  # Confidence needed for weight changes
+        self.confidence_threshold = 0.95  # Confidence needed for weight changes (p < 0.05)
+        self.update_every = 25  # Retrain after this many new trades...
+        self.update_interval = 300  # ...or this many seconds, whichever comes first
+        self._trades_since_update = 0
+        self._last_update_ts = time.monotonic()
+        self._parquet_enabled = True  # Turned off on first save without a Parquet engine
+        self.compact_every = 10_000  # Trades journaled between full rewrites of the learning data
+        self._saved_count = 0  # Trades in the last successful full save
+        self._compaction_queued = False
+        
+        # Saves happen on the shared writer thread so recording a trade never waits on disk
+        _start_writer()
         
         # Load existing learning data
         self.learning_data = self._load_learning_data()
+        self._metrics_cache = None
+        self._metrics_cache_key = None
+        
+        # Columns and running per-feature medians, fed incrementally from learning_data
+        self._columns = _TradeColumns.allocate()
+        self._medians = {feature: _RunningMedian() for feature in _FEATURES}
         
         print("🧠 OPTIONS LEARNING SYSTEM INITIALIZED")
         print("   🔬 Adaptive weight optimization")
@@ -56,18 +349,59 @@ class OptionsLearningSystem:
         print(f"   📈 Learning from {len(self.learning_data)} historical trades")
     
     def _load_learning_data(self) -> List[Dict]:
-        """Load historical learning data"""
+        """Load historical learning data: the last full save (Parquet or JSON) plus the journal"""
         try:
-            learning_file = "data/learning/options_learning_data.json"
-            if os.path.exists(learning_file):
-                with open(learning_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('trades', [])
+            trades = []
+            candidates = [f for f in (LEARNING_PARQUET_FILE, LEARNING_JSON_FILE) if os.path.exists(f)]
+            if candidates:
+                trades = self._read_learning_file(max(candidates, key=os.path.getmtime))
+            
+            journal = self._read_journal(len(trades))
+            self._saved_count = len(trades)
+            return trades + journal
         except Exception as e:
             print(f"   ⚠️ Could not load learning data: {e}")
         
         return []
     
+    def _read_learning_file(self, learning_file: str) -> List[Dict]:
+        """Parse a full save, reusing the class-wide parse cache while the file is unchanged"""
+        st = os.stat(learning_file)
+        cached = self._parsed_cache.get(learning_file)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return list(cached[2])
+        
+        if learning_file == LEARNING_PARQUET_FILE:
+            # Columns are unioned on save; drop the filler so trades keep their own keys
+            rows = pd.read_parquet(learning_file).to_dict('records')
+            trades = [{k: v for k, v in row.items() if not _is_missing(v)} for row in rows]
+        else:
+            with open(learning_file, 'rb') as f:
+                trades = _loads(f.read()).get('trades', [])
+        
+        self._parsed_cache[learning_file] = (st.st_mtime_ns, st.st_size, trades)
+        return list(trades)
+    
+    def _read_journal(self, saved_count: int) -> List[Dict]:
+        """Trades appended since the last full save of `saved_count` trades"""
+        if not os.path.exists(LEARNING_JOURNAL_FILE):
+            return []
+        
+        entries = []
+        with open(LEARNING_JOURNAL_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    entries.append(_loads(line))
+                except ValueError:
+                    break  # Torn final line from an interrupted append
+        if not entries:
+            return []
+        
+        # The header records which trade the journal starts at; anything before
+        # saved_count was already compacted into the full save
+        start = entries[0].get('journal_start', 0)
+        return entries[1:][max(0, saved_count - start):]
+    
     def record_trade_outcome(self, trade_data: Dict):
         """Record a completed trade for learning"""
         
@@ -76,96 +410,186 @@ class OptionsLearningSystem:
         
         # Add to learning data
         self.learning_data.append(trade_data)
+        self._metrics_cache = None
+        self._metrics_cache_key = None
+        self._sync_trades()
         
         # Save updated data
         self._save_learning_data()
         
         print(f"📝 Recorded trade outcome: {trade_data['symbol']} - {'WIN' if trade_data['win'] else 'LOSS'}")
         
-        # Trigger learning if we have enough data
-        if len(self.learning_data) >= self.min_samples:
+        # Trigger learning if we have enough data (batched, not on every trade)
+        self._trades_since_update += 1
+        if (len(self.learning_data) >= self.min_samples and
+                (self._trades_since_update >= self.update_every or
+                 time.monotonic() - self._last_update_ts >= self.update_interval)):
             self.update_model()
     
+    def force_update(self):
+        """Update model weights now, without waiting for the next batch"""
+        self.update_model()
+    
     def _save_learning_data(self):
-        """Save learning data to file"""
+        """Queue the newest trade for the journal, plus a full save once compact_every trades are journaled
+        
+        The full save counts as done only when it succeeds; until then the journal keeps every trade.
+        """
+        _write_q.put((self, 'append', (len(self.learning_data) - 1, self.learning_data[-1])))
+        if (len(self.learning_data) - self._saved_count >= self.compact_every
+                and not self._compaction_queued):
+            self._compaction_queued = True
+            _write_q.put((self, 'compact', list(self.learning_data)))
+    
+    def _append_to_journal(self, entries: List[Tuple[int, Dict]]):
+        """Append (index, trade) entries to the JSONL journal in one write"""
+        if not entries:
+            return
         try:
-            os.makedirs("data/learning", exist_ok=True)
-            learning_file = "data/learning/options_learning_data.json"
+            os.makedirs(LEARNING_DIR, exist_ok=True)
+            lines = []
+            if not os.path.exists(LEARNING_JOURNAL_FILE):
+                lines.append(_dumps({'journal_start': entries[0][0]}))
+            lines += [_dumps(trade) for _, trade in entries]
             
-            with open(learning_file, 'w') as f:
-                json.dump({
+            with open(LEARNING_JOURNAL_FILE, 'ab') as f:
+                f.write(b''.join(line + b'\n' for line in lines))
+        except Exception as e:
+            print(f"   ❌ Could not append to learning journal: {e}")
+    
+    def flush(self):
+        """Block until all recorded trades have been written to disk"""
+        _write_q.join()
+    
+    def _write_learning_data(self, trades: List[Dict]) -> bool:
+        """Save all learning data (Parquet when an engine is available, else JSON) and clear the journal
+        
+        Writes go to a temp file that replaces the real one, so readers never see a partial file.
+        Returns whether the save (including clearing the journal) succeeded.
+        """
+        try:
+            os.makedirs(LEARNING_DIR, exist_ok=True)
+            
+            learning_file = None
+            if self._parquet_enabled:
+                try:
+                    tmp_file = f"{LEARNING_PARQUET_FILE}.tmp"
+                    pd.DataFrame(trades).to_parquet(tmp_file, compression='snappy', index=False)
+                    os.replace(tmp_file, LEARNING_PARQUET_FILE)
+                    learning_file = LEARNING_PARQUET_FILE
+                except ImportError:
+                    print("   ⚠️ Parquet needs pyarrow (or fastparquet), saving learning data as JSON")
+                    self._parquet_enabled = False
+                except (ValueError, TypeError) as e:
+                    # Mixed-type columns Arrow can't store; JSON takes anything
+                    print(f"   ⚠️ Could not write Parquet ({e}), saving learning data as JSON")
+            
+            if learning_file is None:
+                payload = {
                     'last_updated': datetime.now().isoformat(),
-                    'total_trades': len(self.learning_data),
-                    'trades': self.learning_data
-                }, f, indent=2, default=str)
+                    'total_trades': len(trades),
+                    'trades': trades
+                }
+                tmp_file = f"{LEARNING_JSON_FILE}.tmp"
+                with open(tmp_file, 'wb') as f:
+                    f.write(_dumps(payload))
+                os.replace(tmp_file, LEARNING_JSON_FILE)
+                learning_file = LEARNING_JSON_FILE
+            
+            self._remember_saved(learning_file, trades)
+            
+            # Everything journaled is in the full save now (a crash before this
+            # line is harmless: the journal header lets the loader skip them)
+            if os.path.exists(LEARNING_JOURNAL_FILE):
+                os.remove(LEARNING_JOURNAL_FILE)
+            return True
                 
         except Exception as e:
             print(f"   ❌ Could not save learning data: {e}")
+            return False
+    
+    def _remember_saved(self, learning_file: str, trades: List[Dict]):
+        """Prime the parse cache with what was just written, so new instances skip the parse"""
+        st = os.stat(learning_file)
+        self._parsed_cache[learning_file] = (st.st_mtime_ns, st.st_size, trades)
+    
+    def _sync_trades(self):
+        """Feed trades appended since the last sync into the columns and running medians"""
+        if self._columns.size > len(self.learning_data):
+            # History was truncated or replaced; start over
+            self._columns = _TradeColumns.allocate()
+            self._medians = {feature: _RunningMedian() for feature in _FEATURES}
+        
+        pending = self.learning_data[self._columns.size:]
+        if not pending:
+            return
+        
+        start = self._columns.size
+        if len(pending) == 1:
+            self._columns.append(pending[0])
+        else:
+            self._columns.extend(pending)
+        
+        # Medians over the stored (float32) values so the split compares like with like
+        X, outcomes, returns = self._columns.view()
+        labelled = ~np.isnan(outcomes[start:]) & ~np.isnan(returns[start:])
+        for j, feature in enumerate(_FEATURES):
+            values = X[j, start:][labelled]
+            values = values[~np.isnan(values)]
+            if not len(self._medians[feature]) and len(values) > 1:
+                self._medians[feature] = _RunningMedian.from_values(values)
+            else:
+                for value in values.tolist():
+                    self._medians[feature].push(value)
     
-    def analyze_feature_performance(self) -> Dict[str, LearningMetrics]:
-        """Analyze how different features correlate with success"""
+    def analyze_feature_performance(self, verbose: bool = False) -> Dict[str, LearningMetrics]:
+        """Analyze how different features correlate with success (verbose prints per-feature detail)"""
         
         if len(self.learning_data) < self.min_samples:
             print(f"   ⚠️ Need at least {self.min_samples} trades for analysis")
             return {}
         
-        print(f"\n🔍 ANALYZING FEATURE PERFORMANCE ({len(self.learning_data)} trades)")
-        print("=" * 60)
+        # Metrics depend only on the trade history and the current weights
+        cache_key = (len(self.learning_data), tuple(self.weights.items()))
+        if cache_key == self._metrics_cache_key:
+            if verbose:
+                self._print_feature_metrics(self._metrics_cache)
+            return dict(self._metrics_cache)
         
         metrics = {}
         
-        # Features to analyze
-        features = [
-            'liquidity_score', 'value_score', 'momentum_score', 'volatility_score',
-            'risk_score', 'technical_strength', 'moneyness', 'days_to_expiry',
-            'implied_volatility', 'spread_pct', 'volume', 'open_interest'
-        ]
-        
-        for feature in features:
-            if not any(feature in trade for trade in self.learning_data):
-                continue
-            
-            # Get feature values and outcomes
-            feature_values = []
-            outcomes = []
-            returns = []
-            
-            for trade in self.learning_data:
-                if feature in trade and 'win' in trade and 'pnl_percent' in trade:
-                    feature_values.append(trade[feature])
-                    outcomes.append(trade['win'])
-                    returns.append(trade['pnl_percent'])
-            
-            if len(feature_values) < 5:  # Need minimum samples
-                continue
+        self._sync_trades()
+        # A running median holds exactly its feature's labelled values, so its size is
+        # the sample count: features that were never recorded are skipped without a scan
+        n_valid = np.array([len(self._medians[feature]) for feature in _FEATURES], dtype=np.float64)
+        covered = n_valid >= 5  # Need minimum samples
+        if covered.any():
+            X, outcomes, returns = self._columns.view()
+            medians = np.array([self._medians[feature].median() if ok else np.nan
+                                for feature, ok in zip(_FEATURES, covered)])
+            _, n_high, wins_high, wins_low, ret_high, ret_low, sq_high, sq_low = _split_stats(
+                X, outcomes, returns, medians)
+            n_low = n_valid - n_high
+            p_values = _welch_p_values(ret_high, sq_high, n_high, ret_low, sq_low, n_low)
+        
+        for j in np.flatnonzero(covered):
+            feature = _FEATURES[j]
             
             # Split into high/low groups
-            median_value = np.median(feature_values)
-            
-            high_indices = [i for i, v in enumerate(feature_values) if v >= median_value]
-            low_indices = [i for i, v in enumerate(feature_values) if v < median_value]
-            
-            if len(high_indices) < 3 or len(low_indices) < 3:
+            if n_high[j] < 3 or n_low[j] < 3:
                 continue
             
             # Calculate metrics
-            high_outcomes = [outcomes[i] for i in high_indices]
-            low_outcomes = [outcomes[i] for i in low_indices]
-            high_returns = [returns[i] for i in high_indices]
-            low_returns = [returns[i] for i in low_indices]
-            
-            win_rate_high = np.mean(high_outcomes) * 100
-            win_rate_low = np.mean(low_outcomes) * 100
-            avg_return_high = np.mean(high_returns)
-            avg_return_low = np.mean(low_returns)
+            win_rate_high = wins_high[j] / n_high[j] * 100
+            win_rate_low = wins_low[j] / n_low[j] * 100
+            avg_return_high = ret_high[j] / n_high[j]
+            avg_return_low = ret_low[j] / n_low[j]
             
             # Calculate predictive power (difference in win rates)
             predictive_power = abs(win_rate_high - win_rate_low) / 100
             
-            # Calculate confidence (based on sample size and effect size)
-            sample_size_factor = min(len(feature_values) / 50, 1.0)  # Max confidence at 50+ samples
-            effect_size_factor = min(predictive_power * 2, 1.0)  # Stronger effects = higher confidence
-            confidence = (sample_size_factor + effect_size_factor) / 2
+            # Confidence that high/low returns really differ (Welch's t-test)
+            confidence = 1 - p_values[j]
             
             # Suggest new weight
             current_weight = self.weights.get(feature, 0.1)
@@ -191,19 +615,38 @@ class OptionsLearningSystem:
                 suggested_weight=suggested_weight,
                 confidence=confidence
             )
-            
-            print(f"📊 {feature.upper()}:")
-            print(f"   Win Rate: High {win_rate_high:.1f}% vs Low {win_rate_low:.1f}%")
-            print(f"   Avg Return: High {avg_return_high:+.1f}% vs Low {avg_return_low:+.1f}%")
-            print(f"   Predictive Power: {predictive_power:.3f} | Confidence: {confidence:.2f}")
-            print(f"   Weight: {current_weight:.3f} → {suggested_weight:.3f}")
-            print()
         
-        return metrics
+        if verbose:
+            self._print_feature_metrics(metrics)
+        elif logger.isEnabledFor(logging.DEBUG):
+            for m in metrics.values():
+                logger.debug("📊 %s: win rate %.1f%% vs %.1f%%, return %+.1f%% vs %+.1f%%, power %.3f, confidence %.2f, weight %.3f → %.3f",
+                             m.feature_name, m.win_rate_high, m.win_rate_low, m.avg_return_high, m.avg_return_low,
+                             m.predictive_power, m.confidence, m.current_weight, m.suggested_weight)
+        
+        self._metrics_cache = metrics
+        self._metrics_cache_key = cache_key
+        return dict(metrics)
+    
+    def _print_feature_metrics(self, metrics: Dict[str, LearningMetrics]):
+        """Print the per-feature breakdown"""
+        print(f"\n🔍 ANALYZING FEATURE PERFORMANCE ({len(self.learning_data)} trades)")
+        print("=" * 60)
+        
+        for m in metrics.values():
+            print(f"📊 {m.feature_name.upper()}:")
+            print(f"   Win Rate: High {m.win_rate_high:.1f}% vs Low {m.win_rate_low:.1f}%")
+            print(f"   Avg Return: High {m.avg_return_high:+.1f}% vs Low {m.avg_return_low:+.1f}%")
+            print(f"   Predictive Power: {m.predictive_power:.3f} | Confidence: {m.confidence:.2f}")
+            print(f"   Weight: {m.current_weight:.3f} → {m.suggested_weight:.3f}")
+            print()
     
     def update_model(self):
         """Update model weights based on learning"""
         
+        self._trades_since_update = 0
+        self._last_update_ts = time.monotonic()
+        
         print(f"\n🎯 UPDATING MODEL WEIGHTS")
         print("=" * 40)
         
@@ -232,13 +675,13 @@ class OptionsLearningSystem:
                 print(f"✅ Updated {feature}: {old_weight:.3f} → {new_weight:.3f}")
         
         if updates_made > 0:
-            # Normalize weights to sum to 1.0 (excluding negative weights)
-            positive_weights = {k: v for k, v in self.weights.items() if v > 0}
-            total_positive = sum(positive_weights.values())
+            # Scale so the positive weights sum to 1.0; penalties (negative weights) get
+            # the same factor so they keep their size relative to the positives
+            values = np.fromiter(self.weights.values(), dtype=np.float64, count=len(self.weights))
+            total_positive = values[values > 0].sum()
             
             if total_positive > 0:
-                for feature in positive_weights:
-                    self.weights[feature] = positive_weights[feature] / total_positive
+                self.weights = dict(zip(self.weights, (values / total_positive).tolist()))
             
             # Save updated weights
             self._save_model_weights()
@@ -279,11 +722,13 @@ class OptionsLearningSystem:
         print("=" * 50)
         
         # Overall performance metrics
-        wins = sum(1 for trade in self.learning_data if trade.get('win', False))
+        self._sync_trades()
+        _, outcomes, returns = self._columns.view()
+        wins = int(np.count_nonzero(np.nan_to_num(outcomes)))
         total_trades = len(self.learning_data)
         win_rate = (wins / total_trades) * 100 if total_trades > 0 else 0
         
-        avg_return = np.mean([trade.get('pnl_percent', 0) for trade in self.learning_data])
+        avg_return = np.where(np.isnan(returns), 0, returns).mean()
         
         print(f"📈 Overall Performance:")
         print(f"   Total Trades: {total_trades}")
@@ -305,12 +750,9 @@ class OptionsLearningSystem:
             print(f"   Predictive Power: {worst_feature.predictive_power:.3f}")
         
         # Success patterns
-        successful_trades = [trade for trade in self.learning_data if trade.get('win', False)]
-        failed_trades = [trade for trade in self.learning_data if not trade.get('win', False)]
-        
-        if successful_trades and failed_trades:
+        if 0 < wins < total_trades:
             # Analyze patterns in successful trades
-            success_patterns = self._analyze_success_patterns(successful_trades, failed_trades)
+            success_patterns = self._analyze_success_patterns()
             
             print(f"\n🎯 SUCCESS PATTERNS:")
             for pattern, description in success_patterns.items():
@@ -325,14 +767,21 @@ class OptionsLearningSystem:
             'learning_confidence': len(self.learning_data) / 100  # Confidence improves with more data
         }
     
-    def _analyze_success_patterns(self, wins: List[Dict], losses: List[Dict]) -> Dict[str, str]:
+    def _analyze_success_patterns(self) -> Dict[str, str]:
         """Identify patterns that separate winners from losers"""
         
         patterns = {}
         
+        self._sync_trades()
+        X, outcomes, _ = self._columns.view()
+        win = np.nan_to_num(outcomes) != 0
+        days = X[_FEATURES.index('days_to_expiry')].astype(np.float64)
+        iv = X[_FEATURES.index('implied_volatility')].astype(np.float64)
+        days = np.where(np.isnan(days), 30, days)
+        iv = np.where(np.isnan(iv), 0.2, iv)
+        
         # Days to expiry pattern
-        win_days = np.mean([trade.get('days_to_expiry', 30) for trade in wins])
-        loss_days = np.mean([trade.get('days_to_expiry', 30) for trade in losses])
+        win_days, loss_days = days[win].mean(), days[~win].mean()
         
         if abs(win_days - loss_days) > 5:
             if win_days > loss_days:
@@ -340,11 +789,11 @@ class OptionsLearningSystem:
             else:
                 patterns['Timing'] = f"Shorter-dated options perform better ({win_days:.0f} vs {loss_days:.0f} days)"
         
-        # Option type pattern
-        win_calls = sum(1 for trade in wins if trade.get('option_type') == 'CALL')
-        win_puts = sum(1 for trade in wins if trade.get('option_type') == 'PUT')
-        loss_calls = sum(1 for trade in losses if trade.get('option_type') == 'CALL')
-        loss_puts = sum(1 for trade in losses if trade.get('option_type') == 'PUT')
+        # Option type pattern: one bincount over (type, outcome) pairs
+        option_type = self._columns.option_type[:self._columns.size]
+        known = option_type >= 0
+        counts = np.bincount(option_type[known] * 2 + win[known], minlength=2 * len(_OPTION_TYPES))
+        loss_calls, win_calls, loss_puts, win_puts = counts.tolist()
         
         if win_calls + loss_calls > 0 and win_puts + loss_puts > 0:
             call_win_rate = win_calls / (win_calls + loss_calls) * 100
@@ -357,8 +806,7 @@ class OptionsLearningSystem:
                     patterns['Direction'] = f"Puts outperform calls ({put_win_rate:.0f}% vs {call_win_rate:.0f}%)"
         
         # Volatility pattern
-        win_iv = np.mean([trade.get('implied_volatility', 0.2) for trade in wins])
-        loss_iv = np.mean([trade.get('implied_volatility', 0.2) for trade in losses])
+        win_iv, loss_iv = iv[win].mean(), iv[~win].mean()
         
         if abs(win_iv - loss_iv) > 0.05:
             if win_iv > loss_iv:
@@ -5,15 +5,42 @@ Real-time options, stocks, with <20ms latency
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from requests_cache import CachedSession, DO_NOT_CACHE, NEVER_EXPIRE
+except ImportError:
+    CachedSession = None
+    DO_NOT_CACHE = NEVER_EXPIRE = None
+
+_OPTION_SIDES = {'CALL': 'C', 'PUT': 'P'}
+
+@lru_cache(maxsize=64)
+def _parse_expiry(expiry: str) -> datetime:
+    return datetime.strptime(expiry, '%Y-%m-%d')
+
+@lru_cache(maxsize=64)
+def _fmt_expiry(expiry: str) -> str:
+    """2025-08-29 -> 250829 (YYMMDD)"""
+    return _parse_expiry(expiry).strftime('%y%m%d')
+
 @dataclass
 class PolygonOptionData:
     symbol: str
@@ -40,108 +67,152 @@ class PolygonOptionData:
     timestamp: str
 
 class PolygonDataProvider:
-    def __init__(self, api_key: str = None):
-        """Initialize Polygon.io provider with real-time capabilities"""
+    def __init__(self, api_key: str = None, verify: bool = False, verbose: bool = False):
+        """Initialize Polygon.io provider with real-time capabilities
+        
+        verify=True checks the connection up front; verbose=True prints the startup banner.
+        """
+        self.verbose = verbose
         self.api_key = api_key or os.getenv('POLYGON_API_KEY')
         if not self.api_key:
             raise ValueError("Polygon API key required. Set POLYGON_API_KEY environment variable or pass api_key parameter.")
         
         self.base_url = "https://api.polygon.io"
-        self.session = requests.Session()
+        if CachedSession:
+            # Reference data and closed aggregate ranges don't change intraday; cache them on disk
+            self.session = CachedSession('polygon_cache', backend='sqlite', expire_after=timedelta(hours=12),
+                                         allowable_methods=('GET',), ignored_parameters=['apikey'])
+        else:
+            self.session = requests.Session()
         self.session.params = {'apikey': self.api_key}
+        # Keep-alive pool sized for batch fetches; retry transient errors with backoff
+        # (requests already sends keep-alive and gzip headers)
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'], raise_on_status=False)
+        self.session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry))
         
-        # Rate limiting
-        self.requests_made = 0
-        self.last_reset = time.time()
+        # Rate limiting (token bucket) - conservative 50 requests/minute, adjust based on your plan
+        self.capacity = 50
+        self.rate = 50 / 60.0
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()  # Batch fetches share the bucket across threads
+        self._snapshots_available = True  # Cleared on a 403 from the options snapshot endpoint
         
         # Test connection
-        self._test_connection()
+        if verify:
+            self._test_connection()
         
-        print("🚀 Polygon.io Data Provider initialized")
-        print("   ⚡ Real-time data: <20ms latency")
-        print("   📊 Options coverage: 1.67M+ tickers")
-        print("   🎯 Greeks: Live Delta, Gamma, Theta, Vega")
-        print("   💎 Institutional-grade data quality")
+        if self.verbose:
+            print("🚀 Polygon.io Data Provider initialized")
+            print("   ⚡ Real-time data: <20ms latency")
+            print("   📊 Options coverage: 1.67M+ tickers")
+            print("   🎯 Greeks: Live Delta, Gamma, Theta, Vega")
+            print("   💎 Institutional-grade data quality")
     
     def _test_connection(self):
         """Test API connection and get account info"""
         try:
-            response = self.session.get(f"{self.base_url}/v1/marketstatus/now")
+            response = self._get(f"{self.base_url}/v1/marketstatus/now", expire_after=DO_NOT_CACHE)
             if response.status_code == 200:
-                market_status = response.json()
+                market_status = self._json(response)
                 print(f"   ✅ Connection verified - Market: {market_status.get('market', 'Unknown')}")
             else:
                 print(f"   ⚠️ Connection test failed: {response.status_code}")
         except Exception as e:
             print(f"   ❌ Connection error: {e}")
     
-    def _rate_limit_check(self):
-        """Basic rate limiting (adjust based on your plan)"""
-        current_time = time.time()
-        if current_time - self.last_reset > 60:  # Reset every minute
-            self.requests_made = 0
-            self.last_reset = current_time
+    def _refill_tokens(self):
+        """Credit tokens earned since the last refill (caller holds _rate_lock)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    def _rate_limit_check(self, cost: float = 1):
+        """Token-bucket rate limiting: bursts up to capacity, sustained `rate` requests/sec
         
-        # Conservative rate limiting - adjust based on your plan
-        if self.requests_made > 50:  # 50 requests per minute
-            sleep_time = 60 - (current_time - self.last_reset)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                self.requests_made = 0
-                self.last_reset = time.time()
+        Called before every request; only sleeps as long as needed for the next token.
+        Tokens are reserved under the lock (going negative when depleted) and the wait
+        happens outside it, so concurrent callers queue up at the sustained rate.
+        """
+        with self._rate_lock:
+            self._refill_tokens()
+            self.tokens -= cost
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _get(self, url: str, params: Dict = None, expire_after=None):
+        """GET through the response cache when available; cache hits don't spend rate-limit tokens
+        
+        expire_after overrides the session TTL (DO_NOT_CACHE for live data, NEVER_EXPIRE for closed ranges).
+        """
+        if not CachedSession:
+            self._rate_limit_check()
+            return self.session.get(url, params=params)
+        
+        response = self.session.get(url, params=params, expire_after=expire_after)
+        if not getattr(response, 'from_cache', False):
+            self._rate_limit_check()
+        return response
+    
+    def _json(self, response):
+        """Parse a response body straight from bytes (orjson when installed)"""
+        return orjson.loads(response.content) if orjson is not None else response.json()
+    
+    def _aggs_expiry(self, end_date: str, today: str):
+        """Ranges ending before today are final; anything touching today is live"""
+        return NEVER_EXPIRE if end_date < today else DO_NOT_CACHE
     
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> Optional[Dict]:
         """Get stock data from Polygon with comprehensive metrics"""
-        self._rate_limit_check()
-        
         try:
+            now = datetime.now()
+            today = now.strftime('%Y-%m-%d')
             if not end_date:
-                end_date = datetime.now().strftime('%Y-%m-%d')
+                end_date = today
             if not start_date:
-                start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+                start_date = (now - timedelta(days=365)).strftime('%Y-%m-%d')
             
             print(f"🔥 Fetching {symbol} from Polygon.io...")
             
             # Get aggregates (OHLCV data)
             aggs_url = f"{self.base_url}/v2/aggs/ticker/{symbol}/range/1/day/{start_date}/{end_date}"
-            response = self.session.get(aggs_url)
-            self.requests_made += 1
+            response = self._get(aggs_url, expire_after=self._aggs_expiry(end_date, today))
             
             if response.status_code != 200:
                 print(f"   ❌ Polygon aggregates failed: {response.status_code}")
                 return None
             
-            data = response.json()
+            data = self._json(response)
             if not data.get('results'):
                 print(f"   ❌ No data in Polygon response")
                 return None
             
             # Convert to DataFrame
             results = data['results']
-            df_data = []
+            n = len(results)
             
-            for bar in results:
-                df_data.append({
-                    'Date': pd.to_datetime(bar['t'], unit='ms'),
-                    'Open': bar['o'],
-                    'High': bar['h'], 
-                    'Low': bar['l'],
-                    'Close': bar['c'],
-                    'Volume': bar['v']
-                })
+            def column(key, dtype=np.float64):
+                return np.fromiter((bar[key] for bar in results), dtype=dtype, count=n)
             
-            df = pd.DataFrame(df_data)
-            df.set_index('Date', inplace=True)
+            df = pd.DataFrame({
+                'Open': column('o'),
+                'High': column('h'),
+                'Low': column('l'),
+                'Close': column('c'),
+                'Volume': np.array([bar['v'] for bar in results])  # int64 when Polygon sends integers, as before
+            }, index=pd.DatetimeIndex(column('t', np.int64).view('datetime64[ms]').astype('datetime64[ns]'), name='Date'))
             
             # Get current quote for real-time price
             current_price = df['Close'].iloc[-1]
             try:
                 quote_url = f"{self.base_url}/v2/last/nbbo/{symbol}"
-                quote_response = self.session.get(quote_url)
-                self.requests_made += 1
+                quote_response = self._get(quote_url, expire_after=DO_NOT_CACHE)
                 
                 if quote_response.status_code == 200:
-                    quote_data = quote_response.json()
+                    quote_data = self._json(quote_response)
                     if quote_data.get('results'):
                         current_price = quote_data['results'].get('P', current_price)  # Last price
             except:
@@ -151,11 +222,10 @@ class PolygonDataProvider:
             company_name = symbol
             try:
                 details_url = f"{self.base_url}/v3/reference/tickers/{symbol}"
-                details_response = self.session.get(details_url)
-                self.requests_made += 1
+                details_response = self._get(details_url)
                 
                 if details_response.status_code == 200:
-                    details_data = details_response.json()
+                    details_data = self._json(details_response)
                     if details_data.get('results'):
                         company_name = details_data['results'].get('name', symbol)
             except:
@@ -184,8 +254,6 @@ class PolygonDataProvider:
     def get_options_chain(self, underlying_symbol: str, expiry_date: str = None, 
                          strike_price: float = None) -> Optional[List[Dict]]:
         """Get options chain data from Polygon"""
-        self._rate_limit_check()
-        
         try:
             print(f"📊 Fetching options chain for {underlying_symbol} from Polygon...")
             
@@ -201,14 +269,13 @@ class PolygonDataProvider:
                 params['strike_price'] = strike_price
             
             url = f"{self.base_url}/v3/reference/options/contracts"
-            response = self.session.get(url, params=params)
-            self.requests_made += 1
+            response = self._get(url, params=params)
             
             if response.status_code != 200:
                 print(f"   ❌ Options contracts failed: {response.status_code}")
                 return None
             
-            data = response.json()
+            data = self._json(response)
             contracts = data.get('results', [])
             
             if not contracts:
@@ -223,18 +290,25 @@ class PolygonDataProvider:
             return None
     
     def get_option_price(self, underlying_symbol: str, strike: float, expiry: str, 
-                        option_type: str = 'CALL') -> Optional[PolygonOptionData]:
-        """Get real-time option price with Greeks from Polygon"""
-        self._rate_limit_check()
+                        option_type: str = 'CALL', underlying_price: float = None) -> Optional[PolygonOptionData]:
+        """Get real-time option price with Greeks from Polygon
         
+        underlying_price is only used when the contract snapshot doesn't carry one.
+        """
+        return self._fetch_option_price(underlying_symbol, strike, expiry, option_type,
+                                        underlying_price, self._get_underlying_price)
+    
+    def _fetch_option_price(self, underlying_symbol: str, strike: float, expiry: str, option_type: str,
+                            underlying_price: Optional[float], resolve_underlying) -> Optional[PolygonOptionData]:
+        """get_option_price body; resolve_underlying(symbol) prices the underlying when neither
+        the snapshot nor the caller supplies it"""
         try:
             print(f"💎 Fetching REAL option data: {underlying_symbol} ${strike} {option_type} ({expiry})")
+            now = datetime.now()
             
             # Format option symbol (Polygon format: O:SPY250829C00655000)
-            # Convert 2025-08-29 to 250829
-            exp_date = datetime.strptime(expiry, '%Y-%m-%d')
-            exp_formatted = exp_date.strftime('%y%m%d')  # YYMMDD format
-            option_symbol = f"O:{underlying_symbol}{exp_formatted}{'C' if option_type == 'CALL' else 'P'}{int(strike*1000):08d}"
+            side = _OPTION_SIDES.get(option_type, 'P')
+            option_symbol = f"O:{underlying_symbol}{_fmt_expiry(expiry)}{side}{int(strike*1000):08d}"
             
             print(f"   🔍 Option symbol: {option_symbol}")
             
@@ -248,14 +322,13 @@ class PolygonDataProvider:
                 'limit': 1
             }
             
-            contracts_response = self.session.get(contracts_url, params=contracts_params)
-            self.requests_made += 1
+            contracts_response = self._get(contracts_url, params=contracts_params)
             
             if contracts_response.status_code != 200:
                 print(f"   ❌ Options contracts lookup failed: {contracts_response.status_code}")
                 return None
             
-            contracts_data = contracts_response.json()
+            contracts_data = self._json(contracts_response)
             contracts = contracts_data.get('results', [])
             
             if not contracts:
@@ -268,17 +341,16 @@ class PolygonDataProvider:
             
             # Try delayed quote first (available with $29/month plan)
             # Use aggregates endpoint for delayed data
-            today = datetime.now().strftime('%Y-%m-%d')
-            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+            today = now.strftime('%Y-%m-%d')
+            yesterday = (now - timedelta(days=1)).strftime('%Y-%m-%d')
             
             aggs_url = f"{self.base_url}/v2/aggs/ticker/{option_ticker}/range/1/day/{yesterday}/{today}"
-            aggs_response = self.session.get(aggs_url)
-            self.requests_made += 1
+            aggs_response = self._get(aggs_url, expire_after=DO_NOT_CACHE)  # Range ends today
             
             bid, ask, last_price, volume = 0, 0, 0, 0
             
             if aggs_response.status_code == 200:
-                aggs_data = aggs_response.json()
+                aggs_data = self._json(aggs_response)
                 if aggs_data.get('results'):
                     latest_bar = aggs_data['results'][-1]  # Most recent bar
                     last_price = latest_bar.get('c', 0)  # Close price
@@ -290,12 +362,32 @@ class PolygonDataProvider:
                 print(f"   ❌ Delayed data failed: {aggs_response.status_code}")
                 return None
             
-            # For delayed data, we don't have bid/ask, so use last_price
-            mid_price = last_price
+            # Contract snapshot: underlying price, quote, Greeks, IV and OI in one request
+            snapshot = {}
+            if self._snapshots_available:
+                snapshot_response = self._get(f"{self.base_url}/v3/snapshot/options/{underlying_symbol}/{option_ticker}",
+                                              expire_after=DO_NOT_CACHE)
+                if snapshot_response.status_code == 200:
+                    snapshot = self._json(snapshot_response).get('results') or {}
+                else:
+                    print(f"   ⚠️ Option snapshot unavailable: {snapshot_response.status_code}")
+                    if snapshot_response.status_code == 403:
+                        self._snapshots_available = False  # Not in this plan; stop asking
+            
+            greeks = snapshot.get('greeks') or {}
+            last_quote = snapshot.get('last_quote') or {}
+            bid = last_quote.get('bid', 0) or 0
+            ask = last_quote.get('ask', 0) or 0
+            
+            # Delayed plans have no quote; fall back to last_price
+            mid_price = (bid + ask) / 2 if bid and ask else last_price
             
             # Get underlying price
-            underlying_data = self.get_stock_data(underlying_symbol)
-            underlying_price = underlying_data['metadata']['current_price'] if underlying_data else 0
+            snapshot_underlying = (snapshot.get('underlying_asset') or {}).get('price')
+            if snapshot_underlying:
+                underlying_price = snapshot_underlying
+            elif underlying_price is None:
+                underlying_price = resolve_underlying(underlying_symbol)
             
             # Calculate intrinsic value
             if option_type == 'CALL':
@@ -306,8 +398,7 @@ class PolygonDataProvider:
             time_value = max(0, mid_price - intrinsic_value)
             
             # Calculate days to expiry
-            expiry_date = datetime.strptime(expiry, '%Y-%m-%d')
-            days_to_expiry = (expiry_date - datetime.now()).days
+            days_to_expiry = (_parse_expiry(expiry) - now).days
             
             # Create option data object
             option_data = PolygonOptionData(
@@ -321,18 +412,18 @@ class PolygonDataProvider:
                 ask=ask,
                 mid_price=mid_price,
                 volume=volume,  # From aggregates data
-                open_interest=0,  # Would need separate call
-                implied_volatility=0.0,  # Would need separate call or calculation
-                delta=None,  # Would need Greeks endpoint
-                gamma=None,
-                theta=None,
-                vega=None,
-                rho=None,
+                open_interest=snapshot.get('open_interest', 0) or 0,
+                implied_volatility=snapshot.get('implied_volatility', 0.0) or 0.0,
+                delta=greeks.get('delta'),
+                gamma=greeks.get('gamma'),
+                theta=greeks.get('theta'),
+                vega=greeks.get('vega'),
+                rho=None,  # Not in the snapshot
                 intrinsic_value=intrinsic_value,
                 time_value=time_value,
                 days_to_expiry=days_to_expiry,
                 underlying_price=underlying_price,
-                timestamp=datetime.now().isoformat()
+                timestamp=now.isoformat()
             )
             
             print(f"   ✅ Polygon option: ${mid_price:.2f} (${bid:.2f}/${ask:.2f})")
@@ -342,10 +433,42 @@ class PolygonDataProvider:
             print(f"   ❌ Polygon option error: {e}")
             return None
     
+    def _get_underlying_price(self, symbol: str) -> float:
+        """Current price of an underlying (0 when unavailable)"""
+        underlying_data = self.get_stock_data(symbol)
+        return underlying_data['metadata']['current_price'] if underlying_data else 0
+    
+    def get_option_prices_batch(self, specs: List[Tuple]) -> List[Optional[PolygonOptionData]]:
+        """Fetch many options concurrently; specs are get_option_price argument tuples
+        
+        Contract snapshots carry the underlying price; when they don't, each underlying is
+        priced once (on first need) and shared by its contracts. Results come back in the
+        order of `specs`; the token bucket still bounds the request rate.
+        """
+        if not specs:
+            return []
+        
+        fallback_prices = {}
+        fallback_locks = {}
+        
+        def resolve_underlying(symbol: str) -> float:
+            with fallback_locks.setdefault(symbol, threading.Lock()):
+                if symbol not in fallback_prices:
+                    fallback_prices[symbol] = self._get_underlying_price(symbol)
+                return fallback_prices[symbol]
+        
+        def fetch(spec):
+            underlying_symbol, strike, expiry, *rest = spec
+            option_type = rest[0] if rest else 'CALL'
+            underlying_price = rest[1] if len(rest) > 1 else None
+            return self._fetch_option_price(underlying_symbol, strike, expiry, option_type,
+                                            underlying_price, resolve_underlying)
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(specs))) as executor:
+            return list(executor.map(fetch, specs))
+    
     def get_market_news(self, symbols: List[str] = None, limit: int = 50) -> Optional[List[Dict]]:
         """Get market news from Polygon"""
-        self._rate_limit_check()
-        
         try:
             params = {
                 'limit': limit,
@@ -356,14 +479,13 @@ class PolygonDataProvider:
                 params['ticker'] = ','.join(symbols)
             
             url = f"{self.base_url}/v2/reference/news"
-            response = self.session.get(url, params=params)
-            self.requests_made += 1
+            response = self._get(url, params=params, expire_after=DO_NOT_CACHE)
             
             if response.status_code != 200:
                 print(f"   ❌ News request failed: {response.status_code}")
                 return None
                 
-            data = response.json()
+            data = self._json(response)
             news_items = data.get('results', [])
             
             print(f"   ✅ Retrieved {len(news_items)} news articles")
@@ -374,18 +496,24 @@ class PolygonDataProvider:
             return None
     
     def get_usage_stats(self) -> Dict:
-        """Get current usage statistics"""
+        """Get current usage statistics (token-bucket state as of now)"""
+        with self._rate_lock:
+            self._refill_tokens()
+            tokens = self.tokens
+        
         return {
-            'requests_made_this_minute': self.requests_made,
             'provider': 'polygon.io',
             'data_quality': 'institutional-grade',
             'latency': '<20ms',
-            'last_reset': self.last_reset
+            'tokens_available': max(0.0, tokens),
+            'requests_waiting': int(max(0.0, -tokens)),  # Reserved beyond an empty bucket, still sleeping
+            'bucket_capacity': self.capacity,
+            'refill_per_second': self.rate
         }
 
 def main():
     """Test Polygon.io integration"""
-    provider = PolygonDataProvider()
+    provider = PolygonDataProvider(verify=True, verbose=True)
     
     print("\n🧪 TESTING POLYGON.IO INTEGRATION")
     print("=" * 50)
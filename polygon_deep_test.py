@@ -6,13 +6,25 @@ Final verification - are we using their API correctly?
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from dotenv import load_dotenv
 from datetime import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
+# One keep-alive session for every probe; the API key rides along as a default param
+SESSION = requests.Session()
+SESSION.params = {'apikey': os.getenv('POLYGON_API_KEY')}
+SESSION.mount('https://', HTTPAdapter(pool_maxsize=8))
+
+def fetch_concurrently(urls):
+    """Start independent GETs together; each future's result() returns the response or re-raises"""
+    with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+        return [executor.submit(SESSION.get, url) for url in urls]
+
 def test_polygon_api_endpoints():
     """Test multiple Polygon API endpoints to verify we're using it correctly"""
     
@@ -30,7 +42,7 @@ def test_polygon_api_endpoints():
     print("-" * 30)
     
     try:
-        response = requests.get(f"{base_url}/v1/marketstatus/now?apikey={api_key}")
+        response = SESSION.get(f"{base_url}/v1/marketstatus/now")
         if response.status_code == 200:
             status = response.json()
             print(f"✅ API Access: Working")
@@ -48,7 +60,7 @@ def test_polygon_api_endpoints():
     
     try:
         # Get current SPY price
-        response = requests.get(f"{base_url}/v2/aggs/ticker/SPY/prev?adjusted=true&apikey={api_key}")
+        response = SESSION.get(f"{base_url}/v2/aggs/ticker/SPY/prev?adjusted=true")
         if response.status_code == 200:
             data = response.json()
             if data.get('results'):
@@ -67,7 +79,7 @@ def test_polygon_api_endpoints():
     
     # Try to list available SPY options contracts
     try:
-        response = requests.get(f"{base_url}/v3/reference/options/contracts?underlying_ticker=SPY&limit=10&apikey={api_key}")
+        response = SESSION.get(f"{base_url}/v3/reference/options/contracts?underlying_ticker=SPY&limit=10")
         if response.status_code == 200:
             data = response.json()
             if data.get('results'):
@@ -102,17 +114,24 @@ def test_polygon_api_endpoints():
 def test_options_pricing(contract_ticker):
     """Test different ways to get options pricing data"""
     
-    api_key = os.getenv('POLYGON_API_KEY')
     base_url = "https://api.polygon.io"
     
     print(f"\n💰 TEST 4: Options Pricing Methods")
     print("-" * 30)
     print(f"Testing contract: {contract_ticker}")
     
+    # The four methods are independent, so fetch them all at once and report in order
+    trade, quote, ohlc, snapshot = fetch_concurrently([
+        f"{base_url}/v2/last/trade/{contract_ticker}",
+        f"{base_url}/v2/last/nbbo/{contract_ticker}",
+        f"{base_url}/v2/aggs/ticker/{contract_ticker}/prev?adjusted=true",
+        f"{base_url}/v3/snapshot/options/{contract_ticker}"
+    ])
+    
     # Method 1: Last trade
     print(f"\n🔄 Method 1: Last Trade")
     try:
-        response = requests.get(f"{base_url}/v2/last/trade/{contract_ticker}?apikey={api_key}")
+        response = trade.result()
         if response.status_code == 200:
             data = response.json()
             if data.get('results'):
@@ -128,7 +147,7 @@ def test_options_pricing(contract_ticker):
     # Method 2: Last quote (bid/ask)
     print(f"\n📊 Method 2: Last Quote (Bid/Ask)")
     try:
-        response = requests.get(f"{base_url}/v2/last/nbbo/{contract_ticker}?apikey={api_key}")
+        response = quote.result()
         if response.status_code == 200:
             data = response.json()
             if data.get('results'):
@@ -145,7 +164,7 @@ def test_options_pricing(contract_ticker):
     print(f"\n📈 Method 3: Daily OHLC")
     try:
         # Get previous day's data
-        response = requests.get(f"{base_url}/v2/aggs/ticker/{contract_ticker}/prev?adjusted=true&apikey={api_key}")
+        response = ohlc.result()
         if response.status_code == 200:
             data = response.json()
             if data.get('results'):
@@ -162,7 +181,7 @@ def test_options_pricing(contract_ticker):
     # Method 4: Snapshot (comprehensive)
     print(f"\n📸 Method 4: Options Snapshot")
     try:
-        response = requests.get(f"{base_url}/v3/snapshot/options/{contract_ticker}?apikey={api_key}")
+        response = snapshot.result()
         if response.status_code == 200:
             data = response.json()
             if data.get('results'):
@@ -216,18 +235,18 @@ def test_subscription_level():
     print(f"\n🎫 TEST 5: Subscription Level Check")
     print("-" * 30)
     
-    api_key = os.getenv('POLYGON_API_KEY')
-    
     # Try to access premium endpoints
     premium_tests = [
-        ("Real-time data", f"https://api.polygon.io/v2/last/trade/SPY?apikey={api_key}"),
-        ("Options data", f"https://api.polygon.io/v3/reference/options/contracts?underlying_ticker=SPY&limit=1&apikey={api_key}"),
-        ("Market status", f"https://api.polygon.io/v1/marketstatus/now?apikey={api_key}")
+        ("Real-time data", "https://api.polygon.io/v2/last/trade/SPY"),
+        ("Options data", "https://api.polygon.io/v3/reference/options/contracts?underlying_ticker=SPY&limit=1"),
+        ("Market status", "https://api.polygon.io/v1/marketstatus/now")
     ]
     
-    for test_name, url in premium_tests:
+    futures = fetch_concurrently([url for _, url in premium_tests])
+    
+    for (test_name, _), future in zip(premium_tests, futures):
         try:
-            response = requests.get(url)
+            response = future.result()
             if response.status_code == 200:
                 print(f"✅ {test_name}: Accessible")
             elif response.status_code == 401: